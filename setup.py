@@ -1,7 +1,6 @@
 import ast
-import sys
 
-from setuptools import find_packages, setup, __version__ as setuptools_version
+from setuptools import find_packages, setup
 
 
 def readme():
@@ -29,27 +28,10 @@ def get_version():
 install_requires = [
     'setuptools',
 ]
-below35_requires = [
-    'typing',
-]
-
-# '<' operator for environment markers are supported since setuptools 17.1.
-# Read PEP 496 for details of environment markers.
-setup_requires = ['setuptools >= 17.1']
-if tuple(map(int, setuptools_version.split('.'))) < (17, 1):
-    if 'bdist_wheel' not in sys.argv and sys.version_info < (3, 5):
-        install_requires.extend(below35_requires)
-    extras_require = {
-        ':python_version=={0!r}'.format(pyver): below35_requires
-        for pyver in {'3.4', '3.3'}
-    }
-else:
-    extras_require = {
-        ":python_version<'3.5'": below35_requires,
-    }
+extras_require = {}
 
 tests_require = [
-    'pytest >= 2.9.0',
+    'pytest >= 6.2.0',
     'import-order',
     'flake8',
 ]
@@ -73,18 +55,22 @@ setup(
     author_email='ed' '@' 'spoqa.com',
     license='Public Domain',
     packages=find_packages(exclude=['tests']),
+    python_requires='>=3.9',
     install_requires=install_requires,
-    setup_requires=setup_requires,
     extras_require=extras_require,
+    entry_points={
+        'pytest11': ['tsukkomi = tsukkomi.pytest_plugin'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: Apache Software License',
         'Operating System :: OS Independent',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
         'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: Implementation :: CPython',
         'Topic :: Software Development :: Libraries :: Python Modules'
@@ -0,0 +1,96 @@
+import os
+import time
+
+from pytest import fixture, mark
+
+from tsukkomi import deferred, policy
+from tsukkomi.typed import typechecked
+
+
+@fixture
+def violations():
+    # the pytest plugin forces full mode, which checks calls immediately
+    forced_mode = policy.get_forced_mode()
+    policy.set_forced_mode(None)
+    found = []
+    deferred.set_handler(found.append)
+    yield found
+    deferred.set_handler(None)
+    deferred.set_capacity(deferred.DEFAULT_CAPACITY)
+    policy.set_forced_mode(forced_mode)
+
+
+@typechecked(mode='deferred')
+def greeting(a: str) -> str:
+    return 'hello ' + str(a)
+
+
+def test_deferred(violations):
+    assert greeting('a') == 'hello a'
+    assert greeting(1) == 'hello 1'
+    deferred.flush()
+    assert deferred.pending() == 0
+    assert len(violations) == 1
+    assert isinstance(violations[0], TypeError)
+
+
+def test_deferred_drops_when_full(violations):
+    deferred.set_capacity(1)
+    deferred._stop()
+    try:
+        dropped = deferred.dropped
+        assert deferred.submit(lambda: None)
+        assert not deferred.submit(lambda: None)
+        assert deferred.dropped == dropped + 1
+    finally:
+        deferred._stop()
+        deferred.flush()
+        deferred._stopping.clear()
+
+
+def test_deferred_checks_in_background(violations):
+    greeting(1)
+    for _ in range(100):
+        if violations:
+            break
+        time.sleep(0.01)
+    assert len(violations) == 1
+
+
+@mark.skipif(not hasattr(os, 'fork'), reason='fork() is unavailable')
+def test_deferred_after_fork(violations):
+    greeting('a')
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            greeting(1)
+            for _ in range(100):
+                if violations:
+                    break
+                time.sleep(0.01)
+            os.write(write, str(len(violations)).encode())
+        finally:
+            os._exit(0)
+    os.close(write)
+    try:
+        assert os.read(read, 16) == b'1'
+    finally:
+        os.close(read)
+        os.waitpid(pid, 0)
+
+
+def test_deferred_survives_handler_errors(violations):
+    def handle(e):
+        violations.append(e)
+        raise RuntimeError('broken handler')
+
+    deferred.set_handler(handle)
+    greeting(1)
+    greeting(2)
+    for _ in range(100):
+        if len(violations) >= 2:
+            break
+        time.sleep(0.01)
+    assert len(violations) == 2
+    assert deferred._thread.is_alive()
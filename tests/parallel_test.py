@@ -0,0 +1,30 @@
+import typing
+
+from pytest import raises
+
+from tsukkomi.parallel import check_all
+
+
+def test_check_all_in_process():
+    assert check_all([1, 2, 3], int) == []
+    assert check_all([1, 'a', 2, 'b'], int) == [(1, str), (3, str)]
+    assert check_all([1, 'a', 2, 'b'], int, first=True) == [(1, str)]
+    assert check_all(iter([1, None]), typing.Optional[int]) == []
+
+
+def test_check_all_with_workers():
+    items = list(range(100))
+    items[42] = 'a'
+    items[77] = 4.2
+    assert check_all(items, int, workers=2, chunk_size=10) == [
+        (42, str), (77, float),
+    ]
+    assert check_all(items, int, workers=2, chunk_size=10, first=True) == [
+        (42, str),
+    ]
+    assert check_all(list(range(100)), int, workers=2, chunk_size=10) == []
+
+
+def test_check_all_invalid_chunk_size():
+    with raises(ValueError):
+        check_all([1], int, chunk_size=0)
@@ -0,0 +1,103 @@
+import signal
+
+from pytest import fixture, raises
+
+from tsukkomi import policy
+from tsukkomi.typed import typechecked
+
+
+@fixture
+def reset_policy():
+    # the pytest plugin forces full mode, which overrides policies
+    forced_mode = policy.get_forced_mode()
+    policy.set_forced_mode(None)
+    yield
+    policy.set_forced_mode(forced_mode)
+    policy.set_policy(policy.Policy())
+    policy._path = None
+
+
+@typechecked
+def greeting(a: str) -> str:
+    return a
+
+
+def test_resolve():
+    p = policy.Policy([
+        policy.Rule('billing.*', policy.FULL, 1.0),
+        policy.Rule('api.*', policy.SAMPLE, 0.5),
+        policy.Rule('api.internal.*', policy.OFF, 1.0),
+    ])
+    assert p.resolve('billing.invoice.Invoice.total') == (policy.FULL, 1.0)
+    assert p.resolve('api.user.get') == (policy.SAMPLE, 0.5)
+    assert p.resolve('api.internal.get') == (policy.OFF, 1.0)
+    assert p.resolve('hotloop.run') == (policy.FULL, 1.0)
+
+
+def test_invalid_rule():
+    with raises(ValueError):
+        policy.Policy([policy.Rule('*', 'sometimes', 1.0)])
+    with raises(ValueError):
+        policy.Policy([policy.Rule('*', policy.SAMPLE, 1.5)])
+
+
+def test_load_json(tmpdir):
+    path = tmpdir.join('policy.json')
+    path.write('{"api.*": {"mode": "sample", "sample_rate": 0.2},'
+               ' "hotloop.*": {"mode": "off"}}')
+    p = policy.load(str(path))
+    assert p.resolve('api.get') == (policy.SAMPLE, 0.2)
+    assert p.resolve('hotloop.run')[0] == policy.OFF
+
+
+def test_load_ini(tmpdir):
+    path = tmpdir.join('policy.ini')
+    path.write('[api.*]\nmode = sample\nsample_rate = 0.2\n'
+               '[hotloop.*]\nmode = off\n')
+    p = policy.load(str(path))
+    assert p.resolve('api.get') == (policy.SAMPLE, 0.2)
+    assert p.resolve('hotloop.run')[0] == policy.OFF
+
+
+def test_policy_switches_existing_wrappers(tmpdir, reset_policy):
+    with raises(TypeError):
+        greeting(1)
+    path = tmpdir.join('policy.ini')
+    path.write('[{}.*]\nmode = off\n'.format(__name__))
+    policy.configure(str(path))
+    assert greeting(1) == 1
+    path.write('[{}.*]\nmode = full\n'.format(__name__))
+    policy.reload()
+    with raises(TypeError):
+        greeting(1)
+
+
+def test_sample(reset_policy):
+    policy.set_policy(policy.Policy([
+        policy.Rule(__name__ + '.*', policy.SAMPLE, 0.0),
+    ]))
+    assert greeting(1) == 1
+    policy.set_policy(policy.Policy([
+        policy.Rule(__name__ + '.*', policy.SAMPLE, 1.0),
+    ]))
+    with raises(TypeError):
+        greeting(1)
+
+
+def test_reload_handler_keeps_policy_on_broken_file(tmpdir, reset_policy,
+                                                    caplog):
+    path = tmpdir.join('policy.ini')
+    path.write('[{}.*]\nmode = off\n'.format(__name__))
+    policy.configure(str(path))
+    previous = signal.getsignal(signal.SIGUSR1)
+    policy.install_reload_handler(signal.SIGUSR1)
+    try:
+        path.write('mode = off\n')
+        signal.raise_signal(signal.SIGUSR1)
+        path.write('[{}.*]\nmode = wrong\n'.format(__name__))
+        signal.raise_signal(signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+    assert len(caplog.records) == 2
+    assert policy.get_policy().resolve(__name__ + '.greeting')[0] == \
+        policy.OFF
@@ -0,0 +1,64 @@
+pytest_plugins = 'pytester'
+
+TEST_MODULE = '''
+import time
+import typing
+
+import pytest
+
+from tsukkomi import policy
+from tsukkomi.typed import typechecked
+
+
+@typechecked(mode='off')
+def greeting(a: str) -> str:
+    return a
+
+
+@typechecked
+def slow(a: typing.Tuple[int, ...]) -> int:
+    return len(a)
+
+
+def test_forced_full_mode():
+    assert policy.get_forced_mode() == policy.FULL
+    with pytest.raises(TypeError):
+        greeting(1)
+    slow(tuple(range(100)))
+
+
+@pytest.mark.tsukkomi_budget(1)
+def test_over_budget():
+    for _ in range(100):
+        slow(tuple(range(100)))
+
+
+@pytest.mark.tsukkomi_budget(100)
+def test_in_budget():
+    slow(tuple(range(100)))
+    time.sleep(0.01)
+'''
+
+
+def run(testdir, monkeypatch, *args):
+    monkeypatch.setenv('PYTEST_DISABLE_PLUGIN_AUTOLOAD', '1')
+    testdir.makepyfile(TEST_MODULE)
+    return testdir.runpytest('-p', 'tsukkomi.pytest_plugin', *args)
+
+
+def test_plugin(testdir, monkeypatch):
+    result = run(testdir, monkeypatch)
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines([
+        '*test_over_budget*',
+        '*exceeds the budget 1%*',
+        '*tsukkomi: most expensive hints*',
+        '*typing.Tuple*',
+    ])
+
+
+def test_plugin_warns(testdir, monkeypatch):
+    testdir.makeini('[pytest]\ntsukkomi_budget_action = warn\n')
+    result = run(testdir, monkeypatch)
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(['*TsukkomiBudgetWarning*'])
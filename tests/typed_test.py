@@ -1,9 +1,17 @@
+import gc
+import importlib
+import inspect
+import pickle
+import random
 import re
+import sys
 import typing
 
-from pytest import raises
+from pytest import mark, raises
 
-from tsukkomi.typed import typechecked
+from tsukkomi import policy, typed
+from tsukkomi.typed import (TypeViolation, check_arguments, compile_hint,
+                            depends_on_type_only, memory_usage, typechecked)
 
 T = typing.TypeVar('T')
 
@@ -398,3 +406,569 @@ def test_none():
     assert check_none(None) is None
     with raises(TypeError):
         check_none(123)
+
+
+def test_depends_on_type_only():
+    assert depends_on_type_only(int)
+    assert depends_on_type_only(None)
+    assert depends_on_type_only(typing.Any)
+    assert depends_on_type_only(typing.Optional[str])
+    assert not depends_on_type_only(typing.Tuple[int, int])
+    assert not depends_on_type_only(typing.Callable[[], str])
+    assert not depends_on_type_only(typing.Union[int, typing.Tuple[int]])
+
+
+@typechecked
+def check_inline_cache(a: int, b: typing.Optional[str]=None) -> int:
+    return a
+
+
+def test_inline_cache():
+    for _ in range(3):
+        assert check_inline_cache(1, 'a') == 1
+        assert check_inline_cache(1, b=None) == 1
+        with raises(TypeError):
+            check_inline_cache('a')
+        with raises(TypeError):
+            check_inline_cache(1, b=2)
+
+
+def test_inline_cache_skips_value_dependent_hints():
+    assert check_tuple((1, 2))
+    with raises(TypeError):
+        check_tuple((1, 'a'))
+
+
+class Greeter(object):
+
+    @typechecked
+    @classmethod
+    def create(cls, name: str) -> 'Greeter':
+        return cls()
+
+    @classmethod
+    @typechecked
+    def create2(cls, name: str) -> 'Greeter':
+        return cls()
+
+    @typechecked
+    @staticmethod
+    def greet(name: str) -> str:
+        return name
+
+    @staticmethod
+    @typechecked
+    def greet2(name: str) -> str:
+        return name
+
+    @typechecked
+    @property
+    def name(self) -> str:
+        return 'tsukkomi'
+
+    @property
+    @typechecked
+    def name2(self) -> str:
+        return 1
+
+    @typechecked
+    def annotated_self(self: int, word: str) -> str:
+        return word
+
+    @typechecked
+    def hello(self, word: str) -> str:
+        """Say hello."""
+        return word
+
+
+def test_classmethod():
+    assert isinstance(Greeter.create('a'), Greeter)
+    assert isinstance(Greeter().create2('a'), Greeter)
+    with raises(TypeError):
+        Greeter.create(1)
+    with raises(TypeError):
+        Greeter.create2(1)
+
+
+def test_staticmethod():
+    assert Greeter.greet('a') == 'a'
+    assert Greeter().greet2('a') == 'a'
+    with raises(TypeError):
+        Greeter.greet(1)
+    with raises(TypeError):
+        Greeter().greet2(1)
+
+
+def test_property():
+    assert Greeter().name == 'tsukkomi'
+    with raises(TypeError):
+        Greeter().name2
+
+
+def test_method_skips_receiver():
+    greeter = Greeter()
+    assert greeter.annotated_self('a') == 'a'
+    assert greeter.annotated_self.__name__ == 'annotated_self'
+    with raises(TypeError):
+        greeter.annotated_self(1)
+
+
+def test_memory_usage_shares_checkers():
+    functions = []
+    for _ in range(10):
+        @typechecked
+        def f(a: typing.Dict[str, str]) -> typing.Optional[str]:
+            return a.get('a')
+        assert f({'a': 'b'}) == 'b'
+        functions.append(f)
+    usage = memory_usage()
+    for _ in range(10):
+        @typechecked
+        def g(a: typing.Dict[str, str]) -> typing.Optional[str]:
+            return a.get('a')
+        assert g({'a': 'b'}) == 'b'
+        functions.append(g)
+    assert memory_usage().checkers == usage.checkers
+    assert memory_usage().plans >= 20
+
+
+@typechecked
+def check_variadic(a: str, *args: int, b: str='', **kwargs: float) -> int:
+    return len(args) + len(kwargs)
+
+
+def test_variadic():
+    assert check_variadic('a') == 0
+    assert check_variadic('a', 1, 2, 3) == 3
+    assert check_variadic('a', 1, 2, b='b', c=1.0, d=2.0) == 4
+    with raises(TypeError):
+        check_variadic('a', 1, 'b', 3)
+    with raises(TypeError):
+        check_variadic('a', b=1)
+    with raises(TypeError):
+        check_variadic('a', c='c')
+    with raises(TypeError):
+        check_variadic(1, 2)
+
+
+@typechecked(variadic_sample=10)
+def check_variadic_sample(*args: typing.Tuple[int]) -> int:
+    return len(args)
+
+
+def test_variadic_sample():
+    assert check_variadic_sample(*[(i,) for i in range(1000)]) == 1000
+    with raises(TypeError):
+        check_variadic_sample(*['a'] * 1000)
+
+
+def test_check_arguments_variadic():
+    check_arguments(check_variadic, {'args': int}, 'a', 1, 2)
+    with raises(TypeError):
+        check_arguments(check_variadic, {'args': int}, 'a', 1, 'b')
+
+
+def test_compile_hint():
+    validator = compile_hint(typing.Tuple[int, typing.Optional[str]])
+    assert validator is compile_hint(typing.Tuple[int, typing.Optional[str]])
+    assert validator.check((1, None))
+    assert validator.check((1, 'a'))
+    assert not validator.check((1, 2))
+    assert not validator.check([1, 'a'])
+    validator.validate((1, 'a'))
+    with raises(TypeError):
+        validator.validate((1, 2))
+    assert compile_hint(None).check(None)
+    assert not compile_hint(None).check(0)
+    assert compile_hint(typing.Any).check(object())
+    assert compile_hint(typing.Iterable).check([])
+    assert compile_hint(typing.Callable[[str, int], bool]).check(_call2)
+    assert not compile_hint(typing.Callable[[str, int], bool]).check(_call)
+
+
+def test_compile_hint_nested_union():
+    validator = compile_hint(typing.Union[typing.Tuple[int, int], str])
+    assert validator.check((1, 2))
+    assert validator.check('a')
+    assert not validator.check((1, 'a'))
+
+
+@typechecked
+def check_nested_union(
+    a: typing.Union[typing.Tuple[int, int], str]
+) -> typing.Union[typing.Tuple[int, int], str]:
+    return a
+
+
+def test_nested_union():
+    assert check_nested_union((1, 2)) == (1, 2)
+    assert check_nested_union('a') == 'a'
+    with raises(TypeError):
+        check_nested_union((1, 'a'))
+    with raises(TypeError):
+        check_nested_union(1)
+
+
+@typechecked
+def check_nested_tuple(a: typing.Tuple[int, typing.Tuple[int, str]]) -> int:
+    return a[0]
+
+
+def test_nested_mismatch_path():
+    assert check_nested_tuple((1, (2, 'a'))) == 1
+    with raises(TypeError) as e:
+        check_nested_tuple((1, (2, 3)))
+    assert 'for `a[1][1]`' in str(e.value)
+
+
+def test_check_tuple_does_not_raise():
+    assert typed.check_tuple((1, 2), typing.Tuple[int, int])[1]
+    assert not typed.check_tuple((1, 'a'), typing.Tuple[int, int])[1]
+    assert not typed.check_tuple(None, typing.Tuple[int, int])[1]
+    assert not typed.check_union('a', typing.Union[int, float])[1]
+
+
+def test_compile_hint_modern_typing():
+    assert compile_hint(list[int]).check([1, 2])
+    assert not compile_hint(list[int]).check([1, 'a'])
+    assert compile_hint(dict[str, list[int]]).check({'a': [1]})
+    assert not compile_hint(dict[str, list[int]]).check({'a': ['b']})
+    assert compile_hint(typing.Literal[1, 'a']).check('a')
+    assert not compile_hint(typing.Literal[1, 'a']).check(True)
+    assert compile_hint(typing.Annotated[int, 'meta']).check(1)
+    assert not compile_hint(typing.Annotated[int, 'meta']).check('a')
+    assert compile_hint(typing.Type[int]).check(bool)
+    assert not compile_hint(typing.Type[int]).check(1)
+    assert compile_hint(typing.Tuple[int, ...]).check((1, 2, 3))
+    assert not compile_hint(typing.Tuple[int, ...]).check((1, 'a'))
+    assert compile_hint(typing.Iterable[int]).check(iter([]))
+
+
+@typechecked
+def check_modern(a: dict[str, list[int]]) -> typing.Optional[int]:
+    return None
+
+
+@mark.skipif(sys.version_info < (3, 10), reason='PEP 604 needs Python 3.10')
+def test_compile_hint_union_operator():
+    assert compile_hint(int | None).check(None)
+    assert not compile_hint(int | None).check('a')
+    assert compile_hint(dict[str, int | str]).check({'a': 'b'})
+    assert not compile_hint(dict[str, int | str]).check({'a': None})
+
+
+def test_modern_typing():
+    assert check_modern({'a': [1]}) is None
+    with raises(TypeError) as e:
+        check_modern({'a': [1, 'b']})
+    assert "for `a['a'][1]`" in str(e.value)
+
+
+@typechecked(boundary='package')
+def check_boundary(a: int) -> int:
+    return a
+
+
+@typechecked(boundary=['some.other'])
+def check_other_boundary(a: int) -> int:
+    return a
+
+
+def test_boundary():
+    forced_mode = policy.get_forced_mode()
+    policy.set_forced_mode(None)
+    try:
+        assert check_boundary('a') == 'a'
+        with raises(TypeError):
+            exec('f("a")', {'__name__': 'outside', 'f': check_boundary})
+        with raises(TypeError):
+            check_other_boundary('a')
+        assert check_other_boundary(1) == 1
+        policy.set_forced_mode(policy.FULL)
+        with raises(TypeError):
+            check_boundary('a')
+    finally:
+        policy.set_forced_mode(forced_mode)
+
+
+@typechecked
+def check_violation(a: typing.List[int], *args: str) -> typing.Tuple[int, int]:
+    return tuple(a)
+
+
+def test_type_violation():
+    with raises(TypeViolation) as e:
+        check_violation([1, 'a'])
+    assert e.value.function == 'check_violation'
+    assert e.value.parameter == 'a'
+    assert e.value.expected is int
+    assert e.value.actual_type is str
+    assert e.value.value == 'a'
+    assert e.value.path == (1,)
+    with raises(TypeViolation) as e:
+        check_violation([], 'a', 2)
+    assert e.value.parameter == 'args'
+    assert e.value.path == (1,)
+    assert str(e.value).endswith('for `args[1]`')
+    with raises(TypeViolation) as e:
+        check_violation([1] * 1000000)
+    assert e.value.parameter == 'return'
+    assert len(e.value.value) == 1000000
+    assert len(str(e.value)) < 200
+
+
+class Shape(typing.Protocol):
+
+    name: str
+
+    def area(self, scale: float) -> float:
+        ...
+
+
+class Square(object):
+
+    def __init__(self) -> None:
+        self.name = 'square'
+
+    def area(self, scale: float, offset: float=0.0) -> float:
+        return scale + offset
+
+
+class Circle(object):
+
+    name = 'circle'
+
+    def area(self) -> float:
+        return 3.14
+
+
+def test_compile_hint_protocol():
+    validator = compile_hint(Shape)
+    assert validator.check(Square())
+    assert not validator.check(Circle())
+    assert not validator.check(1)
+    assert compile_hint(typing.SupportsInt).check(1)
+    assert not compile_hint(typing.SupportsInt).check('a')
+    square = Square()
+    del square.name
+    assert not validator.check(square)
+    Circle.area = lambda self, scale: scale
+    try:
+        assert validator.check(Circle())
+    finally:
+        Circle.area = lambda self: 3.14
+    assert not validator.check(Circle())
+
+
+class Reloaded(object):
+    pass
+
+
+@typechecked
+def check_reloaded(a: 'Reloaded', b: typing.List['Reloaded']) -> int:
+    return 1
+
+
+@typechecked
+def check_nested_reloaded(a: "typing.List['Reloaded']") -> int:
+    return 1
+
+
+def test_plan_outdated():
+    global Reloaded
+    assert typed._forward_names(check_reloaded.__annotations__) == (
+        'Reloaded',
+    )
+    assert typed._forward_names(check_nested_reloaded.__annotations__) == (
+        'Reloaded', 'typing.List',
+    )
+    old = Reloaded
+    assert check_reloaded(old(), [old()]) == 1
+    assert check_nested_reloaded([old()]) == 1
+
+    class Reloaded(object):
+        pass
+
+    try:
+        with raises(TypeError):
+            check_reloaded(old(), [])
+        assert check_reloaded(Reloaded(), [Reloaded()]) == 1
+        with raises(TypeError):
+            check_nested_reloaded([old()])
+        with raises(TypeError):
+            check_reloaded(Reloaded(), [old()])
+    finally:
+        Reloaded = old
+    assert check_reloaded(old(), []) == 1
+    annotations = check_reloaded.__annotations__
+    annotations['return'] = str
+    try:
+        with raises(TypeError):
+            check_reloaded(old(), [])
+    finally:
+        annotations['return'] = int
+    assert check_reloaded(old(), []) == 1
+
+
+def test_pickle():
+    assert pickle.loads(pickle.dumps(check_violation)) is check_violation
+
+
+def test_validator_requires_mismatch():
+    class Incomplete(typed.Validator):
+        pass
+
+    with raises(TypeError):
+        Incomplete(int)
+
+
+class Measurable(typing.Protocol):
+
+    def measure(self) -> int:
+        ...
+
+
+class Ruler(object):
+
+    def measure(self) -> int:
+        return 1
+
+
+@typechecked
+def check_measurable(m: Measurable) -> int:
+    return 1
+
+
+def test_typechecked_protocol_class_mutated():
+    measure = Ruler.measure
+    assert check_measurable(Ruler()) == 1
+    del Ruler.measure
+    try:
+        with raises(TypeError):
+            check_measurable(Ruler())
+    finally:
+        Ruler.measure = measure
+    assert check_measurable(Ruler()) == 1
+
+
+def test_bound_method_looks_like_method():
+    hello = Greeter().hello
+    assert str(inspect.signature(hello)) == '(word: str) -> str'
+    assert hello.__doc__ == 'Say hello.'
+    assert hello.__module__ == __name__
+    assert typed.check_callable(hello, typing.Callable[[str], str])[1]
+
+
+class Doubler(object):
+
+    def __call__(self, a: int) -> int:
+        return a * 2
+
+
+def test_callable_instance():
+    double = typechecked(Doubler())
+    assert double(2) == 4
+    with raises(TypeError):
+        double('a')
+    assert double._plan is not None and not double._plan.outdated()
+
+
+class Adder(object):
+
+    @typechecked
+    def add(self, x: int, y: str) -> str:
+        return str(x) + y
+
+
+def test_inline_cache_distinguishes_receiver():
+    adder = Adder()
+    assert adder.add(1, 'a') == '1a'
+    with raises(TypeError):
+        Adder.add(1, 'a')
+
+
+def test_memory_usage_counts_nested_storage():
+    before = memory_usage().size
+    validator = compile_hint(typing.Tuple[(int,) * 100])
+    assert memory_usage().size - before >= sys.getsizeof(validator.items)
+
+
+@typechecked(variadic_sample=10)
+def check_sampled(*args: int) -> int:
+    return len(args)
+
+
+def test_variadic_sample_type_only():
+    values = list(range(999)) + ['a']
+    random.shuffle(values)
+    for _ in range(20):
+        with raises(TypeError):
+            check_sampled(*values)
+
+
+def test_empty_tuple():
+    assert compile_hint(typing.Tuple[()]).check(())
+    assert not compile_hint(typing.Tuple[()]).check((1,))
+    assert compile_hint(tuple[()]).check(())
+
+
+@mark.skipif(sys.version_info < (3, 10), reason='ParamSpec needs Python 3.10')
+def test_check_callable_param_spec():
+    P = typing.ParamSpec('P')
+
+    def f(a: int, b: str) -> str:
+        return b
+
+    assert typed.check_callable(f, typing.Callable[P, str])[1]
+    assert typed.check_callable(
+        f, typing.Callable[typing.Concatenate[int, P], str]
+    )[1]
+    assert not typed.check_callable(
+        f, typing.Callable[typing.Concatenate[str, P], str]
+    )[1]
+
+
+def test_protocol_conformance_is_weak():
+    validator = compile_hint(Measurable)
+
+    class Temporary(object):
+
+        def measure(self) -> int:
+            return 1
+
+    assert validator.check(Temporary())
+    assert Temporary in validator.conformance
+    size = len(validator.conformance)
+    del Temporary
+    gc.collect()
+    assert len(validator.conformance) == size - 1
+
+
+def test_plan_outdated_by_module_reload(tmpdir, monkeypatch):
+    tmpdir.join('tsukkomi_reload_models.py').write(
+        'class User(object):\n    pass\n'
+    )
+    tmpdir.join('tsukkomi_reload_handlers.py').write(
+        'from __future__ import annotations\n'
+        'import tsukkomi_reload_models as models\n'
+        'from tsukkomi.typed import typechecked\n'
+        '@typechecked\n'
+        'def handle(u: models.User) -> int:\n'
+        '    return 1\n'
+    )
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.delitem(sys.modules, 'tsukkomi_reload_models', False)
+    monkeypatch.delitem(sys.modules, 'tsukkomi_reload_handlers', False)
+    import tsukkomi_reload_handlers as handlers
+    import tsukkomi_reload_models as models
+    try:
+        old = models.User
+        assert handlers.handle(old()) == 1
+        importlib.reload(models)
+        assert models.User is not old
+        assert handlers.handle(models.User()) == 1
+        with raises(TypeError):
+            handlers.handle(old())
+    finally:
+        del sys.modules['tsukkomi_reload_models']
+        del sys.modules['tsukkomi_reload_handlers']
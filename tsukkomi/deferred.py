@@ -0,0 +1,183 @@
+""":mod:`tsukkomi.deferred` --- Check types in the background
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:func:`~tsukkomi.typed.typechecked` functions in
+:const:`~tsukkomi.policy.DEFERRED` mode don't check their calls by
+themselves.  They only :func:`submit` what they were given and returned to
+a bounded buffer, and a background thread, which sleeps while the buffer is
+empty, checks them soon after.  Violations are reported to the
+:func:`set_handler` handler instead of being raised.
+
+Since only references to values are recorded, a value mutated before it's
+checked is checked as mutated.
+
+"""
+import atexit
+import collections
+import logging
+import os
+import threading
+import typing
+
+__all__ = (
+    'DEFAULT_CAPACITY', 'dropped', 'flush', 'pending', 'set_capacity',
+    'set_handler', 'submit',
+)
+
+
+#: The default maximum number of records waiting to be checked.
+DEFAULT_CAPACITY = 10000
+
+#: (:class:`int`) The number of records dropped since the buffer was full.
+dropped = 0
+
+_buffer = collections.deque()
+_capacity = DEFAULT_CAPACITY
+_thread = None
+_thread_lock = threading.Lock()
+_stopping = threading.Event()
+_wakeup = threading.Event()
+_logger = logging.getLogger(__name__)
+
+
+def _log_violation(exception: Exception) -> None:
+    _logger.error('%s', exception, exc_info=exception)
+
+
+_handler = _log_violation
+
+
+def set_handler(handler: typing.Optional[typing.Callable[[Exception], None]]
+                ) -> None:
+    """Set the function which is called with an exception whenever
+    a deferred check fails.  It's called in the background thread, or in
+    the thread calling :func:`flush`.  Exceptions it raises are logged.
+
+    :param handler: a function which takes an exception.
+                    :const:`None` to log violations to :mod:`logging`,
+                    which is the default
+
+    """
+    global _handler
+    _handler = _log_violation if handler is None else handler
+
+
+def set_capacity(capacity: int) -> None:
+    """Change the maximum number of records waiting to be checked.
+
+    :param capacity: the maximum number of records
+
+    """
+    global _capacity
+    if capacity < 1:
+        raise ValueError('capacity must be positive, not {!r}'.format(
+            capacity
+        ))
+    _capacity = capacity
+
+
+def pending() -> int:
+    """The number of records waiting to be checked.
+
+    :return: the number of records
+    :rtype: :class:`int`
+
+    """
+    return len(_buffer)
+
+
+def submit(check: typing.Callable[..., None], *args) -> bool:
+    """Record a call of ``check`` to be made in the background.  It never
+    blocks; the record is dropped if the buffer is full.
+
+    :param check: a function which raises :class:`TypeError` for violations
+    :param \\*args: arguments to ``check``
+    :return: :const:`False` if it's dropped
+    :rtype: :class:`bool`
+
+    """
+    global dropped
+    if len(_buffer) >= _capacity:
+        dropped += 1
+        return False
+    _buffer.append((check, args))
+    if not _wakeup.is_set():
+        _wakeup.set()
+    if _thread is None:
+        _start()
+    return True
+
+
+def _run(record: typing.Tuple[typing.Callable[..., None], tuple]) -> None:
+    check, args = record
+    try:
+        check(*args)
+    except Exception as e:
+        try:
+            _handler(e)
+        except Exception as handler_error:
+            # the background thread has to survive broken handlers
+            _logger.error('the handler failed to handle %s', e,
+                          exc_info=handler_error)
+
+
+def flush() -> None:
+    """Check every record waiting in the buffer, in the current thread.
+    It's called at interpreter exit.
+
+    """
+    while True:
+        try:
+            record = _buffer.popleft()
+        except IndexError:
+            break
+        _run(record)
+
+
+def _work() -> None:
+    while not _stopping.is_set():
+        # records appended after clear() set it again, so none is missed
+        _wakeup.wait()
+        _wakeup.clear()
+        flush()
+
+
+def _start() -> None:
+    global _thread
+    with _thread_lock:
+        if _thread is None:
+            thread = threading.Thread(
+                target=_work, name='tsukkomi.deferred', daemon=True
+            )
+            thread.start()
+            _thread = thread
+
+
+def _stop() -> None:
+    global _thread
+    _stopping.set()
+    _wakeup.set()
+    if _thread is not None:
+        _thread.join()
+        _thread = None
+
+
+@atexit.register
+def _shutdown() -> None:
+    _stop()
+    flush()
+
+
+def _reset_in_child() -> None:
+    # the thread doesn't survive fork(), and the records belong to the
+    # parent, which checks them by itself
+    global _buffer, _thread, _thread_lock, _stopping, _wakeup
+    _buffer = collections.deque()
+    _thread = None
+    _thread_lock = threading.Lock()
+    _stopping = threading.Event()
+    _wakeup = threading.Event()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_in_child)
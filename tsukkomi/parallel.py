@@ -0,0 +1,101 @@
+""":mod:`tsukkomi.parallel` --- Check huge collections with multiple processes
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import concurrent.futures
+import os
+import typing
+
+from .typed import Validator, compile_hint
+
+__all__ = 'check_all',
+
+
+#: The default number of items validated by a single worker task.
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _check_chunk(validator: Validator, start: int, chunk: typing.Sequence,
+                 first: bool) -> typing.List[typing.Tuple[int, type]]:
+    failures = []
+    check = validator.check
+    for i, value in enumerate(chunk, start):
+        if not check(value):
+            failures.append((i, validator(value)[0]))
+            if first:
+                break
+    return failures
+
+
+# the validator of each worker process, compiled once by _initialize_worker()
+_worker_validator = None
+
+
+def _initialize_worker(hint: typing.Optional[type]) -> None:
+    global _worker_validator
+    _worker_validator = compile_hint(hint)
+
+
+def _check_worker_chunk(start: int, chunk: typing.Sequence, first: bool
+                        ) -> typing.List[typing.Tuple[int, type]]:
+    return _check_chunk(_worker_validator, start, chunk, first)
+
+
+def check_all(items: typing.Iterable, hint: typing.Optional[type],
+              workers: typing.Optional[int]=None,
+              chunk_size: int=DEFAULT_CHUNK_SIZE,
+              first: bool=False) -> typing.List[typing.Tuple[int, type]]:
+    """Check every item of ``items`` against ``hint`` with a pool of
+    processes.
+
+    ``items`` are split into chunks of ``chunk_size`` and each chunk is
+    validated in a :class:`concurrent.futures.ProcessPoolExecutor`.
+    ``hint`` is sent to each worker once and compiled by
+    :func:`~tsukkomi.typed.compile_hint` there.  If ``items`` are
+    too few to fill two chunks, or only one worker is available, they are
+    checked in the current process since pickling them would cost more than
+    it saves.
+
+    .. code-block:: python
+
+       from tsukkomi.parallel import check_all
+
+       check_all(range(10 ** 7), int, workers=4)  # []
+       check_all([1, 'a', 2, 'b'], int)  # [(1, str), (3, str)]
+
+    :param items: values to check
+    :param hint: expected type of every item of ``items``
+    :param workers: the number of worker processes.  :func:`os.cpu_count` by
+                    default
+    :param chunk_size: the number of items sent to a worker at once
+    :param first: stop at the first incorrect item if :const:`True`
+    :return: ``(index, actual_type)`` pairs of incorrect items, ordered by
+             index.  it is empty if every item is correct
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive, not {!r}'.format(
+            chunk_size
+        ))
+    if not isinstance(items, typing.Sequence):
+        items = list(items)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 2 or len(items) < chunk_size * 2:
+        return _check_chunk(compile_hint(hint), 0, items, first)
+    failures = []
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=_initialize_worker, initargs=(hint,)
+    ) as executor:
+        futures = [
+            executor.submit(_check_worker_chunk, start,
+                            items[start:start + chunk_size], first)
+            for start in range(0, len(items), chunk_size)
+        ]
+        for i, future in enumerate(futures):
+            failures.extend(future.result())
+            if first and failures:
+                for pending in futures[i + 1:]:
+                    pending.cancel()
+                break
+    return failures
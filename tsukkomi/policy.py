@@ -0,0 +1,297 @@
+""":mod:`tsukkomi.policy` --- Per-module checking policy
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A policy decides how thoroughly :func:`~tsukkomi.typed.typechecked`
+functions are checked, by glob patterns on their qualified names
+(``module.qualname``).  It is written in JSON, TOML or INI:
+
+.. code-block:: ini
+
+   [billing.*]
+   mode = full
+
+   [api.*]
+   mode = sample
+   sample_rate = 0.05
+
+   [hotloop.*]
+   mode = off
+
+When several patterns match a function, the longest one wins.  Functions no
+pattern matches are checked in the mode given to
+:func:`~tsukkomi.typed.typechecked`, which is :const:`FULL` by default.
+
+.. code-block:: python
+
+   from tsukkomi import policy
+
+   policy.configure('typecheck.ini')
+   policy.install_reload_handler()  # kill -HUP reloads typecheck.ini
+
+A policy is looked up only when a function's check plan is built; changing
+the policy bumps :data:`generation` so that existing wrappers rebuild their
+plans at their next call.
+
+"""
+import collections
+import configparser
+import fnmatch
+import json
+import logging
+import os.path
+import signal
+import typing
+
+__all__ = (
+    'DEFAULT_SAMPLE_RATE', 'DEFERRED', 'FULL', 'MODES', 'OFF', 'SAMPLE',
+    'Policy', 'Rule', 'configure', 'generation', 'get_forced_mode',
+    'get_policy', 'install_reload_handler', 'load', 'reload', 'resolve',
+    'set_forced_mode', 'set_policy',
+)
+
+
+#: Check every call.
+FULL = 'full'
+
+#: Check randomly chosen calls, at the rate of the rule's ``sample_rate``.
+SAMPLE = 'sample'
+
+#: Check nothing.
+OFF = 'off'
+
+#: Check every call in the background.  See :mod:`tsukkomi.deferred`.
+DEFERRED = 'deferred'
+
+#: (:class:`frozenset`) Every mode a :class:`Rule` can have.
+MODES = frozenset({FULL, SAMPLE, OFF, DEFERRED})
+
+#: The sample rate of :const:`SAMPLE` rules that don't specify it.
+DEFAULT_SAMPLE_RATE = 0.1
+
+#: (:class:`int`) Increased whenever the current policy is replaced.
+generation = 0
+
+#: A rule of :class:`Policy`, which maps functions whose qualified names
+#: match ``pattern`` to ``mode`` and ``sample_rate``.
+Rule = collections.namedtuple('Rule', 'pattern mode sample_rate')
+
+
+class Policy(object):
+    """A set of rules.
+
+    :param rules: rules to apply
+    :type rules: :class:`typing.Iterable` of :class:`Rule`
+
+    """
+
+    def __init__(self, rules: typing.Iterable[Rule]=()) -> None:
+        rules = list(rules)
+        for rule in rules:
+            if rule.mode not in MODES:
+                raise ValueError(
+                    'mode of {!r} must be one of {!r}, not {!r}'.format(
+                        rule.pattern, sorted(MODES), rule.mode
+                    )
+                )
+            if not 0.0 <= rule.sample_rate <= 1.0:
+                raise ValueError(
+                    'sample_rate of {!r} must be between 0 and 1, '
+                    'not {!r}'.format(rule.pattern, rule.sample_rate)
+                )
+        rules.sort(key=lambda rule: len(rule.pattern), reverse=True)
+        self.rules = tuple(rules)
+
+    @classmethod
+    def from_mapping(cls, mapping: typing.Mapping[str, typing.Mapping]
+                     ) -> 'Policy':
+        """Make a policy from a mapping of patterns to mappings which have
+        ``mode`` and optionally ``sample_rate``.
+
+        :param mapping: a mapping of patterns to their settings
+        :return: a policy
+        :rtype: :class:`Policy`
+
+        """
+        return cls(
+            Rule(
+                pattern,
+                settings.get('mode', FULL),
+                float(settings.get('sample_rate', DEFAULT_SAMPLE_RATE))
+            )
+            for pattern, settings in mapping.items()
+        )
+
+    def resolve(self, name: str,
+                default: typing.Tuple[str, float]=(FULL, 1.0)
+                ) -> typing.Tuple[str, float]:
+        """Find the mode and sample rate of a function.
+
+        :param name: the qualified name of a function, i.e.
+                     ``module.qualname``
+        :param default: a pair of mode and sample rate for functions which
+                        no rule matches
+        :return: a pair of mode and sample rate
+
+        """
+        for rule in self.rules:
+            if fnmatch.fnmatchcase(name, rule.pattern):
+                return rule.mode, rule.sample_rate
+        return default
+
+    def __repr__(self) -> str:
+        return '{}.{}({!r})'.format(
+            type(self).__module__, type(self).__qualname__, list(self.rules)
+        )
+
+
+def load(path: str) -> Policy:
+    """Read a policy file.  Its format is decided by its extension:
+    ``.json``, ``.toml`` or INI for the others.  TOML needs :mod:`tomllib`
+    or :mod:`toml` installed.
+
+    :param path: the path of a policy file
+    :return: the read policy
+    :rtype: :class:`Policy`
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path) as f:
+            mapping = json.load(f, object_pairs_hook=collections.OrderedDict)
+    elif extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            import toml
+            with open(path) as f:
+                mapping = toml.load(f)
+        else:
+            with open(path, 'rb') as f:
+                mapping = tomllib.load(f)
+    else:
+        parser = configparser.ConfigParser(interpolation=None)
+        with open(path) as f:
+            parser.read_file(f)
+        mapping = collections.OrderedDict(
+            (section, parser[section]) for section in parser.sections()
+        )
+    return Policy.from_mapping(mapping)
+
+
+_policy = Policy()
+_path = None
+_forced_mode = None
+_logger = logging.getLogger(__name__)
+
+
+def get_policy() -> Policy:
+    """Get the current policy.
+
+    :return: the current policy
+    :rtype: :class:`Policy`
+
+    """
+    return _policy
+
+
+def set_policy(policy: Policy) -> None:
+    """Replace the current policy.  Every
+    :func:`~tsukkomi.typed.typechecked` function follows the new policy from
+    its next call.
+
+    :param policy: a new policy
+    :type policy: :class:`Policy`
+
+    """
+    global _policy, generation
+    _policy = policy
+    generation += 1
+
+
+def get_forced_mode() -> typing.Optional[str]:
+    """Get the mode forced by :func:`set_forced_mode`.
+
+    :return: the forced mode, or :const:`None` if no mode is forced
+    :rtype: :class:`str`
+
+    """
+    return _forced_mode
+
+
+def set_forced_mode(mode: typing.Optional[str]) -> None:
+    """Force every :func:`~tsukkomi.typed.typechecked` function to be
+    checked in ``mode``, regardless of the policy and their own options.
+    The pytest plugin forces :const:`FULL` mode for test sessions.
+
+    :param mode: one of :const:`MODES`, or :const:`None` to stop forcing
+    :type mode: :class:`str`
+
+    """
+    global _forced_mode, generation
+    if mode is not None and mode not in MODES:
+        raise ValueError('mode must be one of {!r}, not {!r}'.format(
+            sorted(MODES), mode
+        ))
+    _forced_mode = mode
+    generation += 1
+
+
+def resolve(name: str, default: typing.Tuple[str, float]=(FULL, 1.0)
+            ) -> typing.Tuple[str, float]:
+    """Find the mode and sample rate of a function by the forced mode or the
+    current policy.
+
+    :param name: the qualified name of a function, i.e.
+                 ``module.qualname``
+    :param default: a pair of mode and sample rate for functions which
+                    no rule matches
+    :return: a pair of mode and sample rate
+
+    """
+    if _forced_mode is not None:
+        return _forced_mode, 1.0
+    return _policy.resolve(name, default)
+
+
+def configure(path: str) -> None:
+    """Load the policy file and make it the current policy.  The path is
+    remembered for :func:`reload`.
+
+    :param path: the path of a policy file
+
+    """
+    global _path
+    set_policy(load(path))
+    _path = path
+
+
+def reload() -> None:
+    """Load the policy file given to :func:`configure` again.
+    It does nothing if :func:`configure` hasn't been called.
+
+    """
+    if _path is not None:
+        set_policy(load(_path))
+
+
+def _reload_on_signal(signum: int, frame) -> None:
+    # an exception raised here would surface from whatever the main thread
+    # happens to run, so a broken file is only logged
+    try:
+        reload()
+    except Exception as e:
+        _logger.error('failed to reload the policy file %r; keeping the '
+                      'current policy', _path, exc_info=e)
+
+
+def install_reload_handler(signum: typing.Optional[int]=None) -> None:
+    """Make the process :func:`reload` the policy file when it receives
+    a signal.  It has to be called from the main thread.  If the file is
+    broken, the error is logged and the current policy is kept.
+
+    :param signum: the signal number.  :const:`signal.SIGHUP` by default
+
+    """
+    if signum is None:
+        signum = signal.SIGHUP
+    signal.signal(signum, _reload_on_signal)
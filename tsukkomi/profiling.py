@@ -0,0 +1,136 @@
+""":mod:`tsukkomi.profiling` --- Measure time spent on checking types
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+While a :class:`Profile` is :func:`start`\\ ed, every
+:func:`~tsukkomi.typed.typechecked` call records how long its checks took,
+per callable object and per hint.
+
+.. code-block:: python
+
+   from tsukkomi import profiling
+
+   profile = profiling.start()
+   run_workload()
+   profiling.stop()
+   for hint, seconds in profile.hints.most_common(5):
+       print(hint, seconds)
+
+"""
+import collections
+import time
+import typing
+
+__all__ = 'Profile', 'current', 'start', 'stop'
+
+
+class Profile(object):
+    """Time spent on checking types.
+
+    .. attribute:: total
+
+       (:class:`float`) Seconds spent on checking in total.
+
+    .. attribute:: functions
+
+       (:class:`collections.Counter`) Seconds spent on checking calls of
+       each :func:`~tsukkomi.typed.typechecked` callable object, by its
+       qualified name.
+
+    .. attribute:: hints
+
+       (:class:`collections.Counter`) Seconds spent on checking values
+       against each hint.
+
+    .. attribute:: hint_calls
+
+       (:class:`collections.Counter`) The number of values checked against
+       each hint.
+
+    .. attribute:: time_hints
+
+       (:class:`bool`) Whether to record :attr:`hints` and
+       :attr:`hint_calls`.  Timing each hint costs more than checking simple
+       hints, and the cost is included in :attr:`total` and
+       :attr:`functions`, so turn it off to measure them accurately.
+
+    :param time_hints: whether to record :attr:`hints` and :attr:`hint_calls`
+    :type time_hints: :class:`bool`
+
+    """
+
+    def __init__(self, time_hints: bool=True) -> None:
+        self.time_hints = time_hints
+        self.total = 0.0
+        self.functions = collections.Counter()
+        self.hints = collections.Counter()
+        self.hint_calls = collections.Counter()
+
+    def time_function(self, name: str, check: typing.Callable[..., None],
+                      *args) -> typing.Any:
+        """Call ``check`` with ``args`` and record its time as spent on
+        checking calls of ``name``.
+
+        :param name: the qualified name of a callable object
+        :param check: a function which checks the call
+        :return: what ``check`` returns
+
+        """
+        started = time.perf_counter()
+        try:
+            return check(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.total += elapsed
+            self.functions[name] += elapsed
+
+    def time_hint(self, hint: typing.Optional[type],
+                  check: typing.Callable[[typing.Any], typing.Any],
+                  value: typing.Any) -> typing.Any:
+        """Call ``check`` with ``value`` and record its time as spent on
+        checking ``hint``.
+
+        :param hint: a type hint
+        :param check: a function which checks ``value`` against ``hint``
+        :param value: a value to check
+        :return: what ``check`` returns
+
+        """
+        started = time.perf_counter()
+        try:
+            return check(value)
+        finally:
+            elapsed = time.perf_counter() - started
+            try:
+                self.hints[hint] += elapsed
+                self.hint_calls[hint] += 1
+            except TypeError:
+                self.hints[repr(hint)] += elapsed
+                self.hint_calls[repr(hint)] += 1
+
+
+#: (:class:`Profile`) The profile which is recording, or :const:`None`.
+current = None
+
+
+def start() -> Profile:
+    """Start recording to a new profile.
+
+    :return: the new profile
+    :rtype: :class:`Profile`
+
+    """
+    global current
+    current = Profile()
+    return current
+
+
+def stop() -> typing.Optional[Profile]:
+    """Stop recording.
+
+    :return: the profile which was recording, if any
+    :rtype: :class:`Profile`
+
+    """
+    global current
+    profile, current = current, None
+    return profile
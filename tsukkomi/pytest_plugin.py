@@ -0,0 +1,162 @@
+""":mod:`tsukkomi.pytest_plugin` --- pytest plugin
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+The plugin is installed along with tsukkomi.  For a test session it:
+
+- forces every :func:`~tsukkomi.typed.typechecked` function to be checked
+  in :const:`~tsukkomi.policy.FULL` mode,
+- :mod:`~tsukkomi.profiling` checks, and fails (or warns) tests marked
+  ``tsukkomi_budget`` whose checking takes more than the budget, a
+  percentage of their runtime,
+- prints the most expensive hints at the end of the session.  Hints
+  checked in tests marked ``tsukkomi_budget`` aren't counted, since timing
+  each hint would inflate their budgets.
+
+.. code-block:: python
+
+   import pytest
+
+
+   @pytest.mark.tsukkomi_budget(5)
+   def test_hot_path():
+       ...
+
+The budget of markers without arguments, what to do on exceeding budgets,
+and the number of hints to print are configured by ini options:
+
+.. code-block:: ini
+
+   [pytest]
+   tsukkomi_budget = 10
+   tsukkomi_budget_action = warn
+   tsukkomi_top_hints = 5
+
+Run pytest with ``-p no:tsukkomi`` to disable it.
+
+"""
+import time
+import typing
+import warnings
+
+import pytest
+
+from . import policy, profiling
+
+__all__ = (
+    'TsukkomiBudgetWarning', 'pytest_addoption', 'pytest_configure',
+    'pytest_runtest_call', 'pytest_runtest_makereport',
+    'pytest_terminal_summary', 'pytest_unconfigure',
+)
+
+
+class TsukkomiBudgetWarning(UserWarning):
+    """Warned when checking types in a test takes more than its budget, and
+    ``tsukkomi_budget_action`` is ``warn``.
+
+    """
+
+
+def pytest_addoption(parser) -> None:
+    parser.addini('tsukkomi_budget',
+                  'percentage of runtime tests marked tsukkomi_budget '
+                  'may spend on checking types',
+                  default='10')
+    parser.addini('tsukkomi_budget_action',
+                  'fail or warn when a test exceeds its budget',
+                  default='fail')
+    parser.addini('tsukkomi_top_hints',
+                  'the number of the most expensive hints to print',
+                  default='10')
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line(
+        'markers',
+        'tsukkomi_budget(percentage): fail if checking types takes more '
+        'than the percentage of the test runtime'
+    )
+    action = config.getini('tsukkomi_budget_action')
+    if action not in ('fail', 'warn'):
+        raise pytest.UsageError(
+            'tsukkomi_budget_action must be fail or warn, not {!r}'.format(
+                action
+            )
+        )
+    config._tsukkomi_previous = (
+        policy.get_forced_mode(), profiling.current
+    )
+    policy.set_forced_mode(policy.FULL)
+    config._tsukkomi_profile = profiling.start()
+
+
+def pytest_unconfigure(config) -> None:
+    try:
+        forced_mode, profile = config._tsukkomi_previous
+    except AttributeError:
+        return
+    policy.set_forced_mode(forced_mode)
+    profiling.current = profile
+
+
+def _get_budget(item) -> typing.Optional[float]:
+    marker = item.get_closest_marker('tsukkomi_budget')
+    if marker is None:
+        return None
+    elif marker.args:
+        return float(marker.args[0])
+    return float(item.config.getini('tsukkomi_budget'))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    profile = profiling.current
+    budget = _get_budget(item)
+    if budget is None or profile is None:
+        yield
+        return
+    # timing each hint would be measured as checking, so it's skipped
+    time_hints = profile.time_hints
+    profile.time_hints = False
+    checked = profile.total
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.time_hints = time_hints
+    elapsed = time.perf_counter() - started
+    checked = profile.total - checked
+    if elapsed > 0 and checked * 100 > elapsed * budget:
+        message = (
+            'checking types took {:.1f}% of the runtime ({:.6f}s of '
+            '{:.6f}s), which exceeds the budget {:g}%'.format(
+                checked * 100 / elapsed, checked, elapsed, budget
+            )
+        )
+        if item.config.getini('tsukkomi_budget_action') == 'warn':
+            warnings.warn(TsukkomiBudgetWarning(message))
+        else:
+            item._tsukkomi_overrun = message
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    message = getattr(item, '_tsukkomi_overrun', None)
+    if message is not None and report.when == 'call' and report.passed:
+        report.outcome = 'failed'
+        report.longrepr = message
+
+
+def pytest_terminal_summary(terminalreporter, config) -> None:
+    profile = getattr(config, '_tsukkomi_profile', None)
+    if profile is None or not profile.hints:
+        return
+    top = int(config.getini('tsukkomi_top_hints'))
+    if top < 1:
+        return
+    terminalreporter.write_sep('=', 'tsukkomi: most expensive hints')
+    for hint, seconds in profile.hints.most_common(top):
+        terminalreporter.write_line('{:.6f}s {:8d} checks  {}'.format(
+            seconds, profile.hint_calls[hint], typing._type_repr(hint)
+        ))
@@ -2,14 +2,26 @@
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
+import abc
+import ast
+import collections
+import collections.abc
 import functools
 import inspect
-import itertools
+import random
+import reprlib
+import sys
+import types
 import typing
+import weakref
+
+from . import deferred, policy, profiling
 
 __all__ = (
+    'MemoryUsage', 'TypeCheckedFunction', 'TypeViolation', 'Validator',
     'check_arguments', 'check_callable', 'check_return', 'check_tuple',
-    'check_type', 'check_union', 'typechecked',
+    'check_type', 'check_union', 'compile_hint', 'depends_on_type_only',
+    'memory_usage', 'typechecked',
 )
 
 
@@ -25,34 +37,18 @@ def check_type(value: typing.Any, hint: typing.Optional[type]) -> bool:
                  as like :mod:`typing` interprets, :const:`None` is interpreted
                  as :class:`types.NoneType`
     :type hint: :class:`typing.Optional`[:class:`type`]
+    :return: the type of given ``value`` and whether it's correct
+
+    It's a shorthand of ``compile_hint(hint)(value)``.  See also
+    :func:`compile_hint`.
 
     """
-    if hint is None:
-        hint = NoneType
-    actual_type = type(value)
-    if hint is NoneType:
-        correct = value is None
-    elif hint is typing.Any:
-        correct = True
-    elif hint is typing.Pattern or hint is typing.Match:
-        correct = isinstance(value, hint.impl_type)
-    elif isinstance(hint, typing.TypeVar):
-        # TODO: Check generic
-        correct = True
-    elif issubclass(hint, typing.Callable):
-        actual_type, correct = check_callable(value, hint)
-    elif issubclass(hint, typing.Tuple):
-        actual_type, correct = check_tuple(value, hint)
-    elif issubclass(hint, typing.Union):
-        actual_type, correct = check_union(value, hint)
-    else:
-        correct = isinstance(value, hint)
-    return actual_type, correct
+    return compile_hint(hint)(value)
 
 
 def check_return(callable_name: str, r: typing.Any,
                  hints: typing.Mapping[str, type]) -> None:
-    """Check return type, raise :class:`TypeError` if return type is not
+    """Check return type, raise :class:`TypeViolation` if return type is not
     expected type.
 
     :param str callable_name: callable name of :func:`~.typechecked` checked
@@ -60,16 +56,11 @@ def check_return(callable_name: str, r: typing.Any,
     :param hints: assumed type of given ``r``
 
     """
-    correct = True
     if 'return' not in hints:
         return
-    _, correct = check_type(r, hints['return'])
-    if not correct:
-        raise TypeError(
-            'Incorrect return type `{}`, expected {}. for: {}'.format(
-                type(r), hints.get('return'), callable_name
-            )
-        )
+    mismatch = compile_hint(hints['return']).mismatch(r)
+    if mismatch is not None:
+        raise TypeViolation(mismatch, callable_name, 'return')
 
 
 def check_callable(callable_: typing.Callable, hint: type) -> bool:
@@ -83,63 +74,55 @@ def check_callable(callable_: typing.Callable, hint: type) -> bool:
     """
     if not callable(callable_):
         return type(callable_), False
-    if callable(callable_) and not hasattr(callable_, '__code__'):
+    function = inspect.unwrap(callable_)
+    args = typing.get_args(hint)
+    if not args or not hasattr(function, '__code__'):
         return type(callable_), True
-    hints = typing.get_type_hints(callable_)
-    return_type = hints.pop('return', type(None))
-    signature = inspect.signature(callable_)
+    params, result = args[0], args[-1]
+    hints = typing.get_type_hints(function)
+    return_type = hints.pop('return', NoneType)
     arg_types = tuple(
-        param.annotation
-        for _, param in signature.parameters.items()
+        hints.get(name, param.annotation)
+        for name, param in inspect.signature(callable_).parameters.items()
     )
-    correct = all({
-        any({
-            hint.__args__ is None,
-            hint.__args__ is Ellipsis,
-            hint.__args__ == arg_types,
-        }),
-        any({
-            hint.__result__ is None,
-            hint.__result__ in (typing.Any, return_type)
-        })
-    })
-    return typing.Callable[list(arg_types), return_type], correct
-
-
-def check_tuple(data: typing.Tuple,
-                hint: typing.Union[type, typing.TypingMeta]) -> bool:
+    if params is Ellipsis or _is_param_spec(params):
+        params_match = True
+    elif (_Concatenate is not None and
+          typing.get_origin(params) is _Concatenate):
+        # Concatenate[int, P] only fixes the first parameters
+        prefix = typing.get_args(params)[:-1]
+        params_match = arg_types[:len(prefix)] == prefix
+    else:
+        params_match = tuple(params) == arg_types
+    if params_match and result in (typing.Any, return_type):
+        return type(callable_), True
+    try:
+        actual_type = typing.Callable[list(arg_types), return_type]
+    except TypeError:
+        actual_type = type(callable_)
+    return actual_type, False
+
+
+_Concatenate = getattr(typing, 'Concatenate', None)
+
+
+def _is_param_spec(hint: typing.Any) -> bool:
+    # typing.ParamSpec is new in Python 3.10
+    param_spec = getattr(typing, 'ParamSpec', None)
+    return param_spec is not None and isinstance(hint, param_spec)
+
+
+def check_tuple(data: typing.Tuple, hint: type) -> bool:
     """Check argument type & return type of :class:`typing.Tuple`. since it
     raises check :class:`typing.Tuple` using `isinstance`, so compare in
     diffrent way
 
     :param data: tuple given as a argument
     :param hint: assumed type of given ``data``
+    :return: the type of given ``data`` and whether it's correct
 
     """
-    if not isinstance(data, tuple):
-        raise TypeError(
-            'expected {}, not {}'.format(
-                typing._type_repr(hint),
-                'None' if data is None else '{}: {!r}'.format(
-                    typing._type_repr(type(data)),
-                    data
-                )
-            )
-        )
-    tuple_param = hint.__tuple_params__
-    if len(data) != len(tuple_param):
-        raise TypeError('expected tuple size is {}, not {}: '
-                        '{!r}'.format(len(tuple_param), len(data), data))
-    zipped = itertools.zip_longest(data, tuple_param)
-    for i, (v, t) in enumerate(zipped):
-        _, correct = check_type(v, t)
-        if not correct:
-            raise TypeError(
-                '{0}th item `{1}` in tuple must be {2!r}, not: {3!r}'.format(
-                    i, v, t, v
-                )
-            )
-    return hint, True
+    return compile_hint(hint)(data)
 
 
 def check_union(data: typing.Union, hint: type) -> bool:
@@ -149,23 +132,17 @@ def check_union(data: typing.Union, hint: type) -> bool:
 
     :param data: union given as a argument
     :param hint: assumed type of given ``data``
+    :return: the type of given ``data`` and whether it's correct
 
     """
-    r = any(check_type(data, t)[1] for t in hint.__union_params__)
-    if not r:
-        raise TypeError(
-            'expected one of {0!r}, found: {1!r}'.format(
-                hint.__union_params__, type(data)
-            )
-        )
-    return hint, r
+    return compile_hint(hint)(data)
 
 
 def check_arguments(c: typing.Callable,
                     hints: typing.Mapping[str, typing.Optional[type]],
                     *args, **kwargs) -> None:
-    """Check arguments type, raise :class:`TypeError` if argument type is not
-    expected type.
+    """Check arguments type, raise :class:`TypeViolation` if argument type is
+    not expected type.
 
     :param c: callable object want to check types
     :param hints: assumed type of given ``c`` result of
@@ -174,21 +151,1254 @@ def check_arguments(c: typing.Callable,
     """
     signature = inspect.signature(c)
     bound = signature.bind(*args, **kwargs)
+    callable_name = getattr(c, '__name__', None)
     for argument_name, value in bound.arguments.items():
         try:
             type_hint = hints[argument_name]
         except KeyError:
             continue
-        actual_type, correct = check_type(value, type_hint)
-        if not correct:
-            raise TypeError(
-                'Incorrect type `{}`, expected `{}` for `{}`'.format(
-                    actual_type, type_hint, argument_name
+        kind = signature.parameters[argument_name].kind
+        if kind == inspect.Parameter.VAR_POSITIONAL:
+            values = enumerate(value)
+        elif kind == inspect.Parameter.VAR_KEYWORD:
+            values = value.items()
+        else:
+            values = (None, value),
+        validator = compile_hint(type_hint)
+        for index, v in values:
+            mismatch = validator.mismatch(v)
+            if mismatch is not None:
+                if index is not None:
+                    mismatch = mismatch.prepend(index)
+                raise TypeViolation(mismatch, callable_name, argument_name)
+
+
+def depends_on_type_only(hint: typing.Optional[type]) -> bool:
+    """Whether :func:`check_type` decides on a value only by its type, i.e.
+    every value of the same type is correct if one of them is correct.
+    It isn't for hints like :class:`typing.Tuple` and :class:`typing.Callable`
+    which look into the value.
+
+    :param hint: a type hint
+    :return: :const:`True` if only the type of a value matters
+
+    """
+    return compile_hint(hint).type_only
+
+
+class Validator(abc.ABC):
+    """A validator made by :func:`compile_hint`, which checks values against
+    its hint without dispatching on the hint again.
+
+    .. attribute:: hint
+
+       The hint it checks values against.
+
+    .. attribute:: type_only
+
+       (:class:`bool`) Whether it decides on a value only by its type.
+       See also :func:`depends_on_type_only`.
+
+    """
+
+    __slots__ = 'hint', 'type_only'
+
+    def __init__(self, hint: typing.Optional[type]) -> None:
+        self.hint = hint
+        self.type_only = True
+
+    @abc.abstractmethod
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        """Find what's wrong with the ``value``.  Validators never raise
+        :class:`TypeError` for incorrect values, but return cheap results
+        which know where the mismatch is.
+
+        :param value: a value to check
+        :return: :const:`None` if the ``value`` is correct
+
+        """
+
+    def check(self, value: typing.Any) -> bool:
+        """Check the ``value``.
+
+        :param value: a value to check
+        :return: :const:`True` if the ``value`` is correct
+
+        """
+        return self.mismatch(value) is None
+
+    def validate(self, value: typing.Any) -> None:
+        """Check the ``value``, raise :class:`TypeViolation` if it's not
+        correct.
+
+        :param value: a value to check
+
+        """
+        mismatch = self.mismatch(value)
+        if mismatch is not None:
+            raise TypeViolation(mismatch)
+
+    def _containers(self) -> typing.Iterable[typing.Any]:
+        # containers the validator owns, for memory_usage()
+        return ()
+
+    def __call__(self, value: typing.Any) -> typing.Tuple[type, bool]:
+        """Check the ``value`` as like :func:`check_type` does."""
+        mismatch = self.mismatch(value)
+        if mismatch is None:
+            return type(value), True
+        elif mismatch.path:
+            return type(value), False
+        return mismatch.actual_type, False
+
+    def __repr__(self) -> str:
+        return '<{} {}>'.format(type(self).__qualname__,
+                                typing._type_repr(self.hint))
+
+
+class _AnyValidator(Validator):
+
+    __slots__ = ()
+
+    def mismatch(self, value: typing.Any) -> None:
+        return None
+
+    def check(self, value: typing.Any) -> bool:
+        return True
+
+
+class _NoneValidator(Validator):
+
+    __slots__ = ()
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        return None if value is None else _Mismatch(self.hint, value)
+
+    def check(self, value: typing.Any) -> bool:
+        return value is None
+
+
+class _InstanceValidator(Validator):
+
+    __slots__ = 'type',
+
+    def __init__(self, hint: typing.Optional[type], type_: type) -> None:
+        super().__init__(hint)
+        self.type = type_
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        if isinstance(value, self.type):
+            return None
+        return _Mismatch(self.hint, value)
+
+    def check(self, value: typing.Any) -> bool:
+        return isinstance(value, self.type)
+
+
+class _CallableValidator(Validator):
+
+    __slots__ = ()
+
+    def __init__(self, hint: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.type_only = False
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        if check_callable(value, self.hint)[1]:
+            return None
+        return _Mismatch(self.hint, value, _CALLABLE)
+
+
+def _tuple_arguments(hint: typing.Optional[type]) -> tuple:
+    args = typing.get_args(hint)
+    # Python 3.9 and 3.10 give ((),) for Tuple[()]
+    return () if args == ((),) else args
+
+
+class _TupleValidator(Validator):
+
+    __slots__ = 'items', 'variadic'
+
+    def __init__(self, hint: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.type_only = False
+        args = _tuple_arguments(hint)
+        self.variadic = len(args) == 2 and args[1] is Ellipsis
+        if hint is typing.Tuple:
+            self.items = None
+        elif self.variadic:
+            self.items = compile_hint(args[0]),
+        else:
+            self.items = tuple(compile_hint(t) for t in args)
+
+    def _containers(self) -> typing.Iterable[typing.Any]:
+        return () if self.items is None else (self.items,)
+
+    def check(self, value: typing.Any) -> bool:
+        if not isinstance(value, tuple):
+            return False
+        items = self.items
+        if items is None:
+            return True
+        elif self.variadic:
+            check = items[0].check
+            return all(check(v) for v in value)
+        return (len(value) == len(items) and
+                all(item.check(v) for item, v in zip(items, value)))
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        if not isinstance(value, tuple):
+            return _Mismatch(self.hint, value, _NOT_TUPLE)
+        items = self.items
+        if items is None:
+            return None
+        elif self.variadic:
+            # check() is cheaper, so mismatches are found only if it fails
+            check = items[0].check
+            if all(check(v) for v in value):
+                return None
+            item_mismatch = items[0].mismatch
+            for i, v in enumerate(value):
+                mismatch = item_mismatch(v)
+                if mismatch is not None:
+                    return mismatch.prepend(i)
+            return None
+        elif len(value) != len(items):
+            return _Mismatch(self.hint, value, _TUPLE_SIZE)
+        for i, (item, v) in enumerate(zip(items, value)):
+            mismatch = item.mismatch(v)
+            if mismatch is not None:
+                return mismatch.prepend(i)
+        return None
+
+
+class _UnionValidator(Validator):
+
+    __slots__ = 'validators',
+
+    def __init__(self, hint: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.validators = tuple(
+            compile_hint(t) for t in typing.get_args(hint)
+        )
+        self.type_only = all(v.type_only for v in self.validators)
+
+    def _containers(self) -> typing.Iterable[typing.Any]:
+        return self.validators,
+
+    def check(self, value: typing.Any) -> bool:
+        return any(v.check(value) for v in self.validators)
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        if self.check(value):
+            return None
+        return _Mismatch(self.hint, value, _UNION)
+
+
+class _CollectionValidator(Validator):
+
+    __slots__ = 'type', 'item'
+
+    def __init__(self, hint: typing.Optional[type], type_: type,
+                 item: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.type = type_
+        self.item = compile_hint(item)
+        self.type_only = isinstance(self.item, _AnyValidator)
+
+    def check(self, value: typing.Any) -> bool:
+        if not isinstance(value, self.type):
+            return False
+        elif self.type_only:
+            return True
+        check = self.item.check
+        return all(check(v) for v in value)
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        if not isinstance(value, self.type):
+            return _Mismatch(self.hint, value)
+        elif self.type_only:
+            return None
+        item = self.item
+        for i, v in enumerate(value):
+            mismatch = item.mismatch(v)
+            if mismatch is not None:
+                return mismatch.prepend(i)
+        return None
+
+
+class _MappingValidator(Validator):
+
+    __slots__ = 'type', 'key', 'value'
+
+    def __init__(self, hint: typing.Optional[type], type_: type,
+                 key: typing.Optional[type],
+                 value: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.type = type_
+        self.key = compile_hint(key)
+        self.value = compile_hint(value)
+        self.type_only = (isinstance(self.key, _AnyValidator) and
+                          isinstance(self.value, _AnyValidator))
+
+    def check(self, value: typing.Any) -> bool:
+        return self.mismatch(value) is None
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        if not isinstance(value, self.type):
+            return _Mismatch(self.hint, value)
+        elif self.type_only:
+            return None
+        # keys are iterated instead of items(), which can be overridden
+        key_validator, value_validator = self.key, self.value
+        for k in value:
+            mismatch = key_validator.mismatch(k)
+            if mismatch is None:
+                mismatch = value_validator.mismatch(value[k])
+            if mismatch is not None:
+                return mismatch.prepend(k)
+        return None
+
+
+class _TypeValidator(Validator):
+
+    __slots__ = 'type',
+
+    def __init__(self, hint: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.type_only = False
+        args = typing.get_args(hint)
+        self.type = args[0] if args and isinstance(args[0], type) else object
+
+    def check(self, value: typing.Any) -> bool:
+        return isinstance(value, type) and issubclass(value, self.type)
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        return None if self.check(value) else _Mismatch(self.hint, value)
+
+
+class _LiteralValidator(Validator):
+
+    __slots__ = 'values',
+
+    def __init__(self, hint: typing.Optional[type]) -> None:
+        super().__init__(hint)
+        self.type_only = False
+        self.values = typing.get_args(hint)
+
+    def _containers(self) -> typing.Iterable[typing.Any]:
+        return self.values,
+
+    def check(self, value: typing.Any) -> bool:
+        # Literal[1] doesn't allow True, though 1 == True
+        return any(type(v) is type(value) and v == value
+                   for v in self.values)
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        return None if self.check(value) else _Mismatch(self.hint, value)
+
+
+_MISSING = object()
+
+
+def _is_protocol(hint: typing.Any) -> bool:
+    return (isinstance(hint, type) and hint is not typing.Protocol and
+            getattr(hint, '_is_protocol', False))
+
+
+def _method_signature(class_: type,
+                      name: str) -> typing.Optional[inspect.Signature]:
+    # the signature without self or cls, or None if it isn't a method
+    attribute = inspect.getattr_static(class_, name, None)
+    if isinstance(attribute, staticmethod):
+        function, bound = attribute.__func__, False
+    elif isinstance(attribute, classmethod):
+        function, bound = attribute.__func__, True
+    elif callable(attribute):
+        function, bound = attribute, True
+    else:
+        return None
+    try:
+        signature = inspect.signature(function)
+    except (TypeError, ValueError):
+        # builtins may not have their signatures
+        return inspect.Signature([
+            inspect.Parameter('args', inspect.Parameter.VAR_POSITIONAL),
+            inspect.Parameter('kwargs', inspect.Parameter.VAR_KEYWORD),
+        ])
+    parameters = list(signature.parameters.values())
+    if bound and parameters and parameters[0].kind in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        del parameters[0]
+    return signature.replace(parameters=parameters)
+
+
+def _accepts(signature: inspect.Signature,
+             expected: inspect.Signature) -> bool:
+    # whether every call the expected signature allows is allowed
+    args = []
+    kwargs = {}
+    for parameter in expected.parameters.values():
+        if parameter.kind == inspect.Parameter.KEYWORD_ONLY:
+            kwargs[parameter.name] = None
+        elif parameter.kind == inspect.Parameter.VAR_POSITIONAL:
+            if not any(p.kind == inspect.Parameter.VAR_POSITIONAL
+                       for p in signature.parameters.values()):
+                return False
+        elif parameter.kind == inspect.Parameter.VAR_KEYWORD:
+            if not any(p.kind == inspect.Parameter.VAR_KEYWORD
+                       for p in signature.parameters.values()):
+                return False
+        else:
+            args.append(None)
+    try:
+        signature.bind(*args, **kwargs)
+    except TypeError:
+        return False
+    return True
+
+
+class _ProtocolValidator(Validator):
+    """Check values structurally against a :class:`typing.Protocol`, i.e.
+    whether their classes have the methods of the protocol with compatible
+    signatures, even if the protocol isn't
+    :func:`~typing.runtime_checkable`.
+
+    Whether a class conforms is decided once and cached in ``conformance``
+    along with the class's members at that time, so that the decision is
+    made again only if the class has been mutated since.  Data members
+    which classes don't have are looked up in values every time.
+
+    """
+
+    __slots__ = 'type', 'members', 'methods', 'conformance'
+
+    def __init__(self, hint: typing.Optional[type], protocol: type) -> None:
+        super().__init__(hint)
+        self.type = protocol
+        try:
+            members = protocol.__protocol_attrs__
+        except AttributeError:
+            members = typing._get_protocol_attrs(protocol)
+        self.members = tuple(sorted(members))
+        self.methods = {}
+        for name in self.members:
+            signature = _method_signature(protocol, name)
+            if signature is not None:
+                self.methods[name] = signature
+        # classes can be mutated after they are proven to conform, so callers
+        # must not cache verdicts by types
+        self.type_only = False
+        # weak, so that classes made at runtime or reloaded can be collected
+        self.conformance = weakref.WeakKeyDictionary()
+
+    def _containers(self) -> typing.Iterable[typing.Any]:
+        yield self.members
+        yield self.methods
+        yield self.conformance.data
+        for entry in self.conformance.values():
+            yield entry
+            yield entry[0]
+
+    def conforms(self,
+                 class_: type) -> typing.Optional[typing.Tuple[str, ...]]:
+        """Decide whether the ``class_`` conforms.
+
+        :return: names of data members which have to be looked up in
+                 instances, or :const:`None` if the ``class_`` doesn't
+                 conform
+
+        """
+        members = tuple(getattr(class_, name, _MISSING)
+                        for name in self.members)
+        try:
+            cached_members, missing = self.conformance[class_]
+        except KeyError:
+            pass
+        else:
+            if cached_members == members:
+                return missing
+        missing = ()
+        for name, member in zip(self.members, members):
+            expected = self.methods.get(name)
+            if member is _MISSING:
+                if expected is not None:
+                    missing = None
+                    break
+                missing += name,
+            elif expected is not None:
+                signature = _method_signature(class_, name)
+                if signature is None or not _accepts(signature, expected):
+                    missing = None
+                    break
+        self.conformance[class_] = members, missing
+        return missing
+
+    def check(self, value: typing.Any) -> bool:
+        missing = self.conforms(type(value))
+        return missing is not None and all(hasattr(value, name)
+                                           for name in missing)
+
+    def mismatch(self, value: typing.Any) -> typing.Optional['_Mismatch']:
+        return None if self.check(value) else _Mismatch(self.hint, value)
+
+
+def _compile_first_argument(hint: typing.Optional[type]) -> Validator:
+    # Annotated[T, ...], ClassVar[T] and Final[T] are checked as T
+    return compile_hint(typing.get_args(hint)[0])
+
+
+#: Factories of validators by the origins of hints, i.e.
+#: :func:`typing.get_origin`.
+_factories = {
+    typing.Union: _UnionValidator,
+    tuple: _TupleValidator,
+    collections.abc.Callable: _CallableValidator,
+    type: _TypeValidator,
+    typing.Literal: _LiteralValidator,
+    typing.Annotated: _compile_first_argument,
+    typing.ClassVar: _compile_first_argument,
+    typing.Final: _compile_first_argument,
+}
+if hasattr(types, 'UnionType'):
+    _factories[types.UnionType] = _UnionValidator
+
+
+def _compile(hint: typing.Optional[type]) -> Validator:
+    if hint is None or hint is NoneType:
+        return _NoneValidator(hint)
+    elif hint is typing.Any or isinstance(hint, (typing.TypeVar, str,
+                                                 typing.ForwardRef)):
+        # TODO: Check generic
+        return _AnyValidator(hint)
+    elif hasattr(hint, '__supertype__'):
+        # typing.NewType
+        return compile_hint(hint.__supertype__)
+    origin = typing.get_origin(hint)
+    if origin is None:
+        if _is_protocol(hint):
+            return _ProtocolValidator(hint, hint)
+        elif isinstance(hint, type):
+            return _InstanceValidator(hint, hint)
+        # hints tsukkomi doesn't understand, e.g. typing.ParamSpec
+        return _AnyValidator(hint)
+    factory = _factories.get(origin)
+    if factory is not None:
+        return factory(hint)
+    elif not isinstance(origin, type):
+        return _AnyValidator(hint)
+    elif _is_protocol(origin):
+        return _ProtocolValidator(hint, origin)
+    args = typing.get_args(hint)
+    if (len(args) == 2 and
+            issubclass(origin, collections.abc.Mapping)):
+        return _MappingValidator(hint, origin, *args)
+    elif (len(args) == 1 and
+            issubclass(origin, collections.abc.Collection) and
+            not issubclass(origin, collections.abc.Iterator)):
+        return _CollectionValidator(hint, origin, args[0])
+    return _InstanceValidator(hint, origin)
+
+
+_validators = {}
+
+
+def compile_hint(hint: typing.Optional[type]) -> Validator:
+    """Make a validator specialized on the structure of the ``hint``.
+    Validators are cached by their hints, so that compiling the same hint
+    again is free, and the same hints share their validator.
+
+    .. code-block:: python
+
+       validator = compile_hint(typing.Tuple[int, typing.Optional[str]])
+       validator.check((1, None))  # True
+       validator.validate((1, 2))  # it raise TypeError
+
+    :param hint: a type hint.  :const:`None` is interpreted as
+                 :class:`types.NoneType`
+    :return: a validator of the ``hint``
+    :rtype: :class:`Validator`
+
+    """
+    try:
+        return _validators[hint]
+    except KeyError:
+        return _validators.setdefault(hint, _compile(hint))
+    except TypeError:
+        # unhashable hints can't be cached
+        return _compile(hint)
+
+
+_CALLABLE = 'callable'
+_NOT_TUPLE = 'not_tuple'
+_TUPLE_SIZE = 'tuple_size'
+_UNION = 'union'
+
+
+_repr = reprlib.Repr()
+_repr.maxstring = _repr.maxother = 80
+
+
+class _Mismatch(object):
+    """What a :class:`Validator` found wrong.  It's cheap to make, since
+    messages are made from it only when a :class:`TypeViolation` is
+    rendered.
+
+    ``hint`` and ``value`` are the innermost ones which don't match, and
+    ``path`` is the indices to reach the ``value`` from the checked value.
+    ``reason`` tells what's wrong if it's more than the type of ``value``.
+
+    """
+
+    __slots__ = 'hint', 'value', 'reason', 'path'
+
+    def __init__(self, hint: typing.Optional[type], value: typing.Any,
+                 reason: typing.Optional[str]=None,
+                 path: typing.Tuple[typing.Any, ...]=()) -> None:
+        self.hint = hint
+        self.value = value
+        self.reason = reason
+        self.path = path
+
+    def prepend(self, index: typing.Any) -> '_Mismatch':
+        return _Mismatch(self.hint, self.value, self.reason,
+                         (index,) + self.path)
+
+    @property
+    def actual_type(self) -> type:
+        if self.reason == _CALLABLE:
+            return check_callable(self.value, self.hint)[0]
+        return type(self.value)
+
+    @property
+    def location(self) -> str:
+        return ''.join('[{}]'.format(_repr.repr(index))
+                       for index in self.path)
+
+    def describe(self) -> typing.Optional[str]:
+        """Describe the ``reason``, or :const:`None` if it's a mismatch of
+        just the type.
+
+        """
+        hint, value = self.hint, self.value
+        if self.reason == _NOT_TUPLE:
+            return 'expected {}, not {}'.format(
+                typing._type_repr(hint),
+                'None' if value is None else '{}: {}'.format(
+                    typing._type_repr(type(value)),
+                    _repr.repr(value)
                 )
             )
+        elif self.reason == _TUPLE_SIZE:
+            return 'expected tuple size is {}, not {}: {}'.format(
+                len(_tuple_arguments(hint)), len(value), _repr.repr(value)
+            )
+        elif self.reason == _UNION:
+            return 'expected one of {0!r}, found: {1!r}'.format(
+                typing.get_args(hint), type(value)
+            )
+        return None
+
+
+class TypeViolation(TypeError):
+    """Raised when a value doesn't match its hint.  It only keeps what's
+    wrong, and its message is rendered when it's needed, e.g. by
+    :func:`str`.  Values in the message are abbreviated as :mod:`reprlib`
+    does, so that failing on a huge value is as cheap as passing it.
+
+    .. attribute:: function
+
+       (:class:`str`) The name of the callable object which was called,
+       or :const:`None`.
+
+    .. attribute:: parameter
+
+       (:class:`str`) The name of the parameter whose argument is incorrect,
+       ``'return'`` if the return value is incorrect, or :const:`None`.
+
+    """
+
+    def __init__(self, mismatch: _Mismatch,
+                 function: typing.Optional[str]=None,
+                 parameter: typing.Optional[str]=None) -> None:
+        super().__init__(mismatch, function, parameter)
+        self.mismatch = mismatch
+        self.function = function
+        self.parameter = parameter
+
+    @property
+    def expected(self) -> typing.Optional[type]:
+        """The hint which isn't matched.  It's the innermost one, e.g.
+        :class:`int` of ``typing.List[int]``.
+
+        """
+        return self.mismatch.hint
+
+    @property
+    def actual_type(self) -> type:
+        """The type of the :attr:`value`."""
+        return self.mismatch.actual_type
+
+    @property
+    def value(self) -> typing.Any:
+        """The incorrect value, which is at the :attr:`path`."""
+        return self.mismatch.value
+
+    @property
+    def path(self) -> typing.Tuple[typing.Any, ...]:
+        """The indices and keys to reach the :attr:`value` from the checked
+        argument or return value.
+
+        """
+        return self.mismatch.path
+
+    def __str__(self) -> str:
+        mismatch = self.mismatch
+        message = mismatch.describe()
+        if self.parameter == 'return':
+            name = self.function
+            if mismatch.path:
+                name += '()' + mismatch.location
+            if message is None:
+                message = 'Incorrect return type `{}`, expected {}. for: {}'
+                return message.format(mismatch.actual_type, mismatch.hint,
+                                      name)
+            elif mismatch.path:
+                message += ' for: {}'.format(name)
+        elif self.parameter is not None:
+            if message is None:
+                return 'Incorrect type `{}`, expected `{}` for `{}{}`'.format(
+                    mismatch.actual_type, mismatch.hint, self.parameter,
+                    mismatch.location
+                )
+            elif mismatch.path:
+                message += ' for `{}{}`'.format(self.parameter,
+                                                mismatch.location)
+        else:
+            if message is None:
+                message = 'expected {}, not {}'.format(
+                    typing._type_repr(mismatch.hint),
+                    typing._type_repr(mismatch.actual_type)
+                )
+            if mismatch.path:
+                message += ' at {}'.format(mismatch.location)
+        return message
+
+
+#: The maximum number of argument type combinations a :func:`typechecked`
+#: callable remembers as correct.
+INLINE_CACHE_SIZE = 4
+
+#: The maximum number of call sites a :func:`typechecked` callable with
+#: a ``boundary`` remembers whether they are trusted.
+TRUSTED_CALLERS_SIZE = 1024
+
+
+def _hint_profile() -> typing.Optional[profiling.Profile]:
+    profile = profiling.current
+    if profile is None or not profile.time_hints:
+        return None
+    return profile
+
+
+def _find_mismatch(checker: Validator, value: typing.Any,
+                   profile: typing.Optional[profiling.Profile]
+                   ) -> typing.Optional[_Mismatch]:
+    if profile is None:
+        return checker.mismatch(value)
+    return profile.time_hint(checker.hint, checker.mismatch, value)
+
+
+def _check_variadic(checker: Validator, callable_name: str, name: str,
+                    values: tuple, sample: typing.Optional[int],
+                    profile: typing.Optional[profiling.Profile]) -> None:
+    # a sample is checked only if the checker isn't type-only, so the
+    # inline cache of argument types, which needs every checker to be
+    # type-only, never remembers types which are sampled
+    if checker.type_only:
+        # a value of each type is enough, which is the first one
+        indices = sorted({
+            type(values[i]): i for i in range(len(values) - 1, -1, -1)
+        }.values())
+    elif sample is not None and len(values) > sample:
+        indices = sorted(random.sample(range(len(values)), sample))
+    else:
+        indices = range(len(values))
+    for i in indices:
+        value = values[i]
+        mismatch = _find_mismatch(checker, value, profile)
+        if mismatch is not None:
+            raise TypeViolation(mismatch.prepend(i), callable_name, name)
+
+
+def _forward_names(annotations: typing.Mapping[str, typing.Any]
+                   ) -> typing.Tuple[str, ...]:
+    names = set()
+    hints = list(annotations.values())
+    while hints:
+        hint = hints.pop()
+        if isinstance(hint, typing.ForwardRef):
+            hint = hint.__forward_arg__
+        elif isinstance(hint, str):
+            pass
+        elif typing.get_origin(hint) is typing.Literal:
+            continue
+        elif typing.get_origin(hint) is typing.Annotated:
+            hints.append(typing.get_args(hint)[0])
+            continue
+        else:
+            # strings in arguments of hints aren't forward references,
+            # unless they're typing.ForwardRef
+            hints.extend(arg for arg in typing.get_args(hint)
+                         if not isinstance(arg, str))
+            continue
+        try:
+            nodes = [ast.parse(hint, mode='eval')]
+        except SyntaxError:
+            continue
+        while nodes:
+            node = nodes.pop()
+            path = []
+            name = node
+            while isinstance(name, ast.Attribute):
+                path.append(name.attr)
+                name = name.value
+            if isinstance(name, ast.Name):
+                # the whole dotted name, since a reloaded module stays the
+                # same object while its attributes are replaced
+                path.append(name.id)
+                names.add('.'.join(reversed(path)))
+            elif (isinstance(node, ast.Constant) and
+                  isinstance(node.value, str)):
+                # quoted names nested in string annotations, e.g.
+                # 'typing.List["Foo"]'
+                hints.append(node.value)
+            else:
+                nodes.extend(ast.iter_child_nodes(node))
+    return tuple(sorted(names))
+
+
+def _resolve_forward_name(globals_: typing.Mapping[str, typing.Any],
+                          name: str) -> typing.Any:
+    first, *attributes = name.split('.')
+    target = globals_.get(first, _MISSING)
+    for attribute in attributes:
+        target = getattr(target, attribute, _MISSING)
+    return target
+
+
+class _CheckPlan(object):
+    """What :func:`typechecked` needs to check calls of a callable object.
+    It's built at the first call, and built again when the
+    :mod:`~tsukkomi.policy` changes or it's :meth:`outdated`.
+
+    Arguments are matched to checkers by their positions and keywords
+    without binding them to the signature.  Extra positional and keyword
+    arguments are checked one by one against the hint of ``*args`` and
+    ``**kwargs``.  If the callable object isn't called correctly, e.g. it
+    lacks an argument, the call itself raises :class:`TypeError` later.
+
+    ``positional`` is a tuple of name and checker pairs of positional
+    parameters, and ``receiver_positional`` is the same but without the
+    first parameter, which is the receiver when the callable object is
+    called as a method.  ``keywords`` maps the names of parameters which
+    can be given by keywords to their checkers.  ``variadic`` and
+    ``variadic_keywords`` are name and checker pairs of ``*args`` and
+    ``**kwargs``.  A checker is :const:`None` if its parameter has no hint.
 
+    ``argument_types`` is the inline cache of argument type combinations
+    already proven correct, or :const:`None` if any argument's hint depends
+    on more than the type of the argument.
 
-def typechecked(call_: typing.Callable[..., T]) -> T:
+    ``trusted_packages`` are packages whose calls aren't checked, or
+    :const:`None` if every call is checked.  Whether a caller is trusted is
+    cached by its code object in ``trusted_callers``.
+
+    ``function`` is the callable object, or its ``__call__()`` method if it's
+    an instance.  ``code``, ``annotations`` and ``forward_targets`` are what
+    the plan was built from: its code object, a copy of its annotations, and
+    the objects which ``forward_names`` in ``globals`` referred to.  Forward
+    references are names in string annotations and
+    :class:`typing.ForwardRef`.
+
+    """
+
+    __slots__ = (
+        'name', 'positional', 'receiver_positional', 'keywords', 'variadic',
+        'variadic_keywords', 'variadic_sample', 'return_checker', 'mode',
+        'sample_rate', 'generation', 'argument_types', 'trusted_packages',
+        'trusted_callers', 'function', 'code', 'annotations', 'globals',
+        'forward_names', 'forward_targets',
+    )
+
+    def __init__(self, call_: typing.Callable, name: str,
+                 default: typing.Tuple[str, float],
+                 variadic_sample: typing.Optional[int]=None,
+                 trusted_packages: typing.Optional[
+                     typing.FrozenSet[str]
+                 ]=None) -> None:
+        if inspect.isroutine(call_) or isinstance(call_, type):
+            function = call_
+        else:
+            # instances of classes which define __call__()
+            function = call_.__call__
+        self.function = function
+        self.name = function.__name__
+        self.generation = policy.generation
+        self.mode, self.sample_rate = policy.resolve(name, default)
+        self.variadic_sample = variadic_sample
+        if policy.get_forced_mode() is None:
+            self.trusted_packages = trusted_packages
+        else:
+            self.trusted_packages = None
+        self.trusted_callers = {}
+        self.code = getattr(function, '__code__', None)
+        annotations = getattr(function, '__annotations__', None)
+        self.annotations = None if annotations is None else dict(annotations)
+        self.globals = getattr(inspect.unwrap(function), '__globals__', {})
+        self.forward_names = _forward_names(annotations or {})
+        self.forward_targets = tuple(
+            _resolve_forward_name(self.globals, name)
+            for name in self.forward_names
+        )
+        if self.mode == policy.OFF:
+            hints = {}
+        else:
+            # typing.ForwardRef remembers what it referred to unless
+            # localns differs from globalns, but it has to be evaluated
+            # again when it refers to another object
+            hints = typing.get_type_hints(function, localns={})
+        self.return_checker = None
+        if 'return' in hints:
+            self.return_checker = compile_hint(hints.pop('return'))
+        positional = []
+        self.keywords = {}
+        self.variadic = self.variadic_keywords = None
+        for param in inspect.signature(call_).parameters.values():
+            checker = None
+            if param.name in hints:
+                checker = compile_hint(hints[param.name])
+            if param.kind == param.VAR_POSITIONAL:
+                self.variadic = param.name, checker
+            elif param.kind == param.VAR_KEYWORD:
+                self.variadic_keywords = param.name, checker
+            else:
+                if param.kind != param.KEYWORD_ONLY:
+                    positional.append((param.name, checker))
+                if param.kind != param.POSITIONAL_ONLY:
+                    self.keywords[param.name] = checker
+        self.positional = tuple(positional)
+        self.receiver_positional = self.positional[1:]
+        if all(compile_hint(hint).type_only for hint in hints.values()):
+            self.argument_types = ()
+        else:
+            self.argument_types = None
+
+    def outdated(self) -> bool:
+        """Whether the ``function`` has changed since the plan was built,
+        e.g. by reloading its module, monkeypatching its annotations or
+        redefining classes it refers to by forward references.
+
+        """
+        function = self.function
+        return (
+            getattr(function, '__code__', None) is not self.code or
+            getattr(function, '__annotations__', None) != self.annotations or
+            bool(self.forward_names) and
+            tuple(_resolve_forward_name(self.globals, name)
+                  for name in self.forward_names) != self.forward_targets
+        )
+
+    def check_arguments(self, receiver: typing.Any, args: tuple,
+                        kwargs: typing.Mapping[str, typing.Any]) -> None:
+        if self.argument_types is not None:
+            # the same arguments are checked against different parameters
+            # whether the receiver is given separately or not
+            key = (receiver is _NO_RECEIVER,) + tuple(map(type, args))
+            if kwargs:
+                key += tuple((k, type(v)) for k, v in kwargs.items()),
+            if key in self.argument_types:
+                return
+        profile = _hint_profile()
+        if receiver is _NO_RECEIVER:
+            positional = self.positional
+        else:
+            positional = self.receiver_positional
+        for (argument_name, checker), value in zip(positional, args):
+            if checker is None:
+                continue
+            mismatch = _find_mismatch(checker, value, profile)
+            if mismatch is not None:
+                raise TypeViolation(mismatch, self.name, argument_name)
+        if len(args) > len(positional) and self.variadic is not None:
+            argument_name, checker = self.variadic
+            if checker is not None:
+                _check_variadic(checker, self.name, argument_name,
+                                args[len(positional):],
+                                self.variadic_sample, profile)
+        keywords = self.keywords
+        for keyword, value in kwargs.items():
+            try:
+                checker = keywords[keyword]
+            except KeyError:
+                if self.variadic_keywords is None:
+                    continue
+                argument_name, checker = self.variadic_keywords
+                index = keyword
+            else:
+                argument_name = keyword
+                index = None
+            if checker is None:
+                continue
+            mismatch = _find_mismatch(checker, value, profile)
+            if mismatch is not None:
+                if index is not None:
+                    mismatch = mismatch.prepend(index)
+                raise TypeViolation(mismatch, self.name, argument_name)
+        if (self.argument_types is not None and
+                len(self.argument_types) < INLINE_CACHE_SIZE):
+            self.argument_types += key,
+
+    def trusts(self, frame: types.FrameType) -> bool:
+        """Whether the call from the ``frame`` is made inside
+        ``trusted_packages``.
+
+        """
+        code = frame.f_code
+        try:
+            return self.trusted_callers[code]
+        except KeyError:
+            pass
+        module = frame.f_globals.get('__name__') or ''
+        trusted = any(module == package or module.startswith(package + '.')
+                      for package in self.trusted_packages)
+        if len(self.trusted_callers) >= TRUSTED_CALLERS_SIZE:
+            self.trusted_callers.clear()
+        self.trusted_callers[code] = trusted
+        return trusted
+
+    def check_return(self, r: typing.Any) -> None:
+        checker = self.return_checker
+        if checker is None:
+            return
+        profile = _hint_profile()
+        mismatch = _find_mismatch(checker, r, profile)
+        if mismatch is not None:
+            raise TypeViolation(mismatch, self.name, 'return')
+
+
+#: The result of :func:`memory_usage`.
+MemoryUsage = collections.namedtuple('MemoryUsage', 'checkers plans size')
+
+
+def memory_usage() -> MemoryUsage:
+    """Measure the memory held by check plans of :func:`typechecked`
+    callables and the checkers they share.  Hints themselves aren't counted,
+    since :mod:`typing` owns them.
+
+    :return: the number of checkers, the number of plans and their total size
+             in bytes
+    :rtype: :class:`MemoryUsage`
+
+    """
+    checkers = list(_validators.values())
+    size = sys.getsizeof(_validators) + sum(map(sys.getsizeof, checkers))
+    for checker in checkers:
+        size += sum(map(sys.getsizeof, checker._containers()))
+    plans = [f._plan for f in list(_functions) if f._plan is not None]
+    for plan in plans:
+        size += sum(map(sys.getsizeof, (
+            plan, plan.positional, plan.receiver_positional, plan.keywords,
+            plan.argument_types, plan.trusted_callers, plan.annotations,
+            plan.forward_names, plan.forward_targets,
+        )))
+        size += sum(sys.getsizeof(pair) for pair in plan.positional)
+        size += sum(sys.getsizeof(pair)
+                    for pair in (plan.variadic, plan.variadic_keywords)
+                    if pair is not None)
+    return MemoryUsage(len(checkers), len(plans), size)
+
+
+_NO_RECEIVER = object()
+
+
+def _check_deferred(plan: _CheckPlan, receiver: typing.Any, args: tuple,
+                    kwargs: typing.Mapping[str, typing.Any],
+                    result: typing.Any) -> None:
+    plan.check_arguments(receiver, args, kwargs)
+    plan.check_return(result)
+
+
+_functions = weakref.WeakSet()
+
+
+class TypeCheckedFunction(object):
+    """A callable object made by :func:`typechecked`.  As like functions,
+    it's a descriptor which is bound to an instance when it's looked up as
+    a method.  A bound one knows its first argument is the receiver, i.e.
+    ``self``, so that it doesn't check it.
+
+    :param call_: callable object want to check types
+    :param receiver: whether the first argument is always a receiver, e.g.
+                     ``cls`` of class methods
+    :type receiver: :class:`bool`
+    :param mode: the mode used unless the :mod:`~tsukkomi.policy` has a rule
+                 for it
+    :type mode: :class:`str`
+    :param sample_rate: the sample rate for :const:`~tsukkomi.policy.SAMPLE`
+                        mode
+    :type sample_rate: :class:`float`
+    :param variadic_sample: the maximum number of ``*args`` to check.
+                            if more are given, randomly chosen ones are
+                            checked, unless the hint depends on types only.
+                            all of them by default
+    :type variadic_sample: :class:`int`
+    :param boundary: packages whose calls are trusted, so that they aren't
+                     checked.  ``'package'`` means the package which
+                     ``call_`` belongs to
+    :type boundary: :class:`str`, :class:`typing.Iterable`\\ [:class:`str`]
+
+    """
+
+    def __init__(self, call_: typing.Callable, receiver: bool=False,
+                 mode: str=policy.FULL,
+                 sample_rate: float=policy.DEFAULT_SAMPLE_RATE,
+                 variadic_sample: typing.Optional[int]=None,
+                 boundary: typing.Union[str, typing.Iterable[str],
+                                        None]=None) -> None:
+        if mode not in policy.MODES:
+            raise ValueError('mode must be one of {!r}, not {!r}'.format(
+                sorted(policy.MODES), mode
+            ))
+        functools.update_wrapper(self, call_)
+        self._name = '{}.{}'.format(
+            call_.__module__,
+            getattr(call_, '__qualname__', type(call_).__qualname__)
+        )
+        self._receiver = receiver
+        self._default = mode, sample_rate
+        self._variadic_sample = variadic_sample
+        if boundary is None:
+            self._trusted_packages = None
+        elif boundary == 'package':
+            self._trusted_packages = frozenset({
+                call_.__module__.partition('.')[0]
+            })
+        elif isinstance(boundary, str):
+            raise ValueError(
+                "boundary must be 'package' or an iterable of package names, "
+                'not {!r}'.format(boundary)
+            )
+        else:
+            self._trusted_packages = frozenset(boundary)
+        self._plan = None
+        _functions.add(self)
+
+    def __reduce__(self) -> str:
+        # pickled by reference, as functions are
+        return self.__qualname__
+
+    def __call__(self, *args, **kwargs):
+        if self._receiver and args:
+            return self._invoke(args[0], args[1:], kwargs)
+        return self._invoke(_NO_RECEIVER, args, kwargs)
+
+    def __get__(self, instance: typing.Any,
+                owner: typing.Optional[type]=None) -> typing.Callable:
+        if instance is None:
+            return self
+        return _BoundTypeCheckedFunction(self, instance)
+
+    def _invoke(self, receiver: typing.Any, args: tuple,
+                kwargs: typing.Mapping[str, typing.Any]) -> typing.Any:
+        call_ = self.__wrapped__
+        plan = self._plan
+        if (plan is None or plan.generation != policy.generation or
+                plan.outdated()):
+            plan = self._plan = _CheckPlan(call_, self._name, self._default,
+                                           self._variadic_sample,
+                                           self._trusted_packages)
+        # the caller's frame is the second one, which called __call__()
+        if plan.mode == policy.OFF or (
+            plan.mode == policy.SAMPLE and
+            random.random() >= plan.sample_rate
+        ) or (
+            plan.trusted_packages is not None and
+            plan.trusts(sys._getframe(2))
+        ):
+            if receiver is _NO_RECEIVER:
+                return call_(*args, **kwargs)
+            return call_(receiver, *args, **kwargs)
+        elif plan.mode == policy.DEFERRED:
+            if receiver is _NO_RECEIVER:
+                result = call_(*args, **kwargs)
+            else:
+                result = call_(receiver, *args, **kwargs)
+            deferred.submit(_check_deferred, plan, receiver, args, kwargs,
+                            result)
+            return result
+        profile = profiling.current
+        if profile is None:
+            plan.check_arguments(receiver, args, kwargs)
+        else:
+            profile.time_function(self._name, plan.check_arguments,
+                                  receiver, args, kwargs)
+        if receiver is _NO_RECEIVER:
+            result = call_(*args, **kwargs)
+        else:
+            result = call_(receiver, *args, **kwargs)
+        if profile is None:
+            plan.check_return(result)
+        else:
+            profile.time_function(self._name, plan.check_return, result)
+        return result
+
+    def __repr__(self) -> str:
+        return '<{} {}>'.format(type(self).__qualname__, self._name)
+
+
+class _BoundTypeCheckedFunction(object):
+    # TypeCheckedFunction bound to a receiver.  As bound methods do, it looks
+    # like the function except for its signature, which lacks the receiver
+
+    __slots__ = '__func__', '__self__'
+
+    def __init__(self, func: TypeCheckedFunction,
+                 receiver: typing.Any) -> None:
+        self.__func__ = func
+        self.__self__ = receiver
+
+    def __call__(self, *args, **kwargs):
+        return self.__func__._invoke(self.__self__, args, kwargs)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.__func__, name)
+
+    @property
+    def __doc__(self) -> typing.Optional[str]:
+        return self.__func__.__doc__
+
+    @property
+    def __module__(self) -> str:
+        return self.__func__.__module__
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        signature = inspect.signature(self.__func__)
+        parameters = list(signature.parameters.values())
+        return signature.replace(parameters=parameters[1:])
+
+    def __repr__(self) -> str:
+        return '<bound {!r} of {!r}>'.format(self.__func__, self.__self__)
+
+
+def typechecked(call_: typing.Optional[typing.Callable[..., T]]=None, *,
+                mode: str=policy.FULL,
+                sample_rate: float=policy.DEFAULT_SAMPLE_RATE,
+                variadic_sample: typing.Optional[int]=None,
+                boundary: typing.Union[str, typing.Iterable[str],
+                                       None]=None) -> T:
     """A decorator to make a callable object checks its types
 
     .. code-block:: python
@@ -209,17 +1419,81 @@ def typechecked(call_: typing.Callable[..., T]) -> T:
        hello_world(3.14, foobar) # it raise TypeError
 
 
+    It also can decorate :func:`classmethod`, :func:`staticmethod` and
+    :class:`property` objects, in either order:
+
+    .. code-block:: python
+
+       class Greeter(object):
+
+           @typechecked
+           @classmethod
+           def create(cls, name: str) -> 'Greeter':
+               return cls()
+
+           @property
+           @typechecked
+           def name(self) -> str:
+               return 'tsukkomi'
+
+    How thoroughly it checks is decided by ``mode``, unless the current
+    :mod:`~tsukkomi.policy` has a rule for the callable object.  Options
+    can be given by calling it without a callable object:
+
+    .. code-block:: python
+
+       @typechecked(mode='deferred')
+       def latency_critical(x: str) -> bool:
+           return x == 'hello world'
+
+    Variadic parameters are checked for each of their values, e.g. every
+    value of ``*args: int`` has to be an :class:`int`.  For very long
+    ``*args``, ``variadic_sample`` limits the number of values to check.
+
+    Calls between functions of the same package are often covered by static
+    analysis.  With ``boundary='package'``, calls from the package which the
+    callable object belongs to aren't checked, but calls from outside are.
+    ``boundary`` also can be names of packages to trust.
+
     :param c: callable object want to check types
     :type c: :class:`typing.Callable`
-    :return:
+    :param mode: one of :const:`~tsukkomi.policy.MODES`.
+                 :const:`~tsukkomi.policy.FULL` by default
+    :type mode: :class:`str`
+    :param sample_rate: the sample rate for :const:`~tsukkomi.policy.SAMPLE`
+                        mode
+    :type sample_rate: :class:`float`
+    :param variadic_sample: the maximum number of ``*args`` to check.
+                            if more are given, randomly chosen ones are
+                            checked, unless the hint depends on types only.
+                            all of them by default
+    :type variadic_sample: :class:`int`
+    :param boundary: ``'package'``, or names of packages whose calls aren't
+                     checked
+    :type boundary: :class:`str`, :class:`typing.Iterable`\\ [:class:`str`]
+    :return: :class:`TypeCheckedFunction`, or a descriptor of the same type
+             as given if it's a class method, static method or property
 
     """
-    @functools.wraps(call_)
-    def decorator(*args, **kwargs):
-        hints = typing.get_type_hints(call_)
-        check_arguments(call_, hints, *args, **kwargs)
-        result = call_(*args, **kwargs)
-        check_return(call_.__name__, result, hints)
-        return result
-
-    return decorator
+    if call_ is None:
+        return functools.partial(typechecked, mode=mode,
+                                 sample_rate=sample_rate,
+                                 variadic_sample=variadic_sample,
+                                 boundary=boundary)
+    options = {
+        'mode': mode, 'sample_rate': sample_rate,
+        'variadic_sample': variadic_sample, 'boundary': boundary,
+    }
+    if isinstance(call_, classmethod):
+        return classmethod(
+            TypeCheckedFunction(call_.__func__, receiver=True, **options)
+        )
+    elif isinstance(call_, staticmethod):
+        return staticmethod(TypeCheckedFunction(call_.__func__, **options))
+    elif isinstance(call_, property):
+        return property(*(
+            f if f is None else TypeCheckedFunction(f, receiver=True,
+                                                    **options)
+            for f in (call_.fget, call_.fset, call_.fdel)
+        ), doc=call_.__doc__)
+    return TypeCheckedFunction(call_, **options)